@@ -1,9 +1,15 @@
 import os
+import hashlib
 import logging
+import time
+from collections import OrderedDict
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 import firebase_admin
 from firebase_admin import credentials, auth
+from config.settings import settings
+from utils.executors import run_io
+from utils.metrics import timed_dependency
 
 # --- Logger ---
 logger = logging.getLogger(__name__)
@@ -24,6 +30,69 @@ except Exception as e:
     logger.critical(f"🔥 FATAL: Firebase initialization failed: {e}")
     raise SystemExit("Firebase Admin SDK initialization failed.")
 
+# --- Verified token cache ---
+class VerifiedTokenCache:
+    """
+    LRU of decoded claims keyed by SHA-256 of the ID token.
+
+    An entry is only served until the token's own `exp`, and the revocation check is
+    repeated once `revocation_check_interval` seconds have passed since the last one.
+    """
+
+    def __init__(self, maxsize: int, revocation_check_interval: float):
+        self.maxsize = maxsize
+        self.revocation_check_interval = revocation_check_interval
+        self._entries: OrderedDict[str, tuple[dict, float, float]] = OrderedDict()  # key -> (claims, exp, checked_at)
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "revocation_checks": 0}
+
+    @staticmethod
+    def key_for(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> tuple[dict, bool] | None:
+        """Return (claims, needs_revocation_check), or None on a miss or an expired token."""
+        entry = self._entries.get(key)
+        now = time.time()
+        if entry is None:
+            return None
+        claims, exp, checked_at = entry
+        if exp <= now:
+            del self._entries[key]
+            self.stats["expired"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return claims, now - checked_at >= self.revocation_check_interval
+
+    def put(self, key: str, claims: dict):
+        self._entries[key] = (claims, float(claims.get("exp", 0)), time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def discard(self, key: str):
+        self._entries.pop(key, None)
+
+    def get_stats(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "size": len(self._entries),
+            "capacity": self.maxsize,
+        }
+
+
+token_cache = VerifiedTokenCache(
+    maxsize=settings.auth_token_cache_size,
+    revocation_check_interval=settings.auth_revocation_check_interval_seconds,
+)
+
+
+def get_token_cache_stats() -> dict:
+    return token_cache.get_stats()
+
+
 # --- Authentication ---
 token_auth_scheme = HTTPBearer()
 
@@ -34,9 +103,29 @@ async def get_current_user(
     Dependency to verify Firebase Bearer token.
     Returns decoded claims.
     Raises HTTPException for invalid tokens.
+
+    Verified tokens are cached until they expire; the revocation round trip to Firebase
+    is repeated at most every `auth_revocation_check_interval_seconds` per token.
     """
+    key = VerifiedTokenCache.key_for(token.credentials)
     try:
-        decoded_token = auth.verify_id_token(token.credentials, check_revoked=True)
+        cached = token_cache.get(key)
+        if cached is not None and not cached[1]:
+            token_cache.stats["hits"] += 1
+            return cached[0]
+
+        if cached is None:
+            token_cache.stats["misses"] += 1
+        else:
+            token_cache.stats["revocation_checks"] += 1
+
+        # Signature verification and the revocation lookup are blocking, keep them off the event loop
+        decoded_token = await run_io(
+            timed_dependency("firebase", "verify_id_token", auth.verify_id_token),
+            token.credentials,
+            check_revoked=True,
+        )
+        token_cache.put(key, decoded_token)
         logger.debug(f"Token verified successfully for UID: {decoded_token.get('uid')}")
         return decoded_token
 
@@ -48,6 +137,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     except auth.RevokedIdTokenError:
+        token_cache.discard(key)
         logger.warning("Token revoked")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
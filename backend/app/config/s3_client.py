@@ -1,10 +1,21 @@
 import boto3
+from utils.metrics import instrument_s3_client
+
+RESUME_BUCKET_NAME = "my-resume-bucket"
 
 def get_s3_client():
-    return boto3.client(
+    return instrument_s3_client(boto3.client(
         "s3",
         endpoint_url="http://localhost:4566",
         aws_access_key_id="test",
         aws_secret_access_key="test",
         region_name="us-east-1"
-    )
+    ))
+
+def create_bucket_if_not_exists(bucket_name: str):
+    """Create the bucket unless it exists. Blocking: called through the io executor at startup."""
+    s3 = get_s3_client()
+    try:
+        s3.head_bucket(Bucket=bucket_name)
+    except s3.exceptions.ClientError:
+        s3.create_bucket(Bucket=bucket_name)
@@ -1,4 +1,5 @@
 # app/config/settings.py
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -12,9 +13,86 @@ class Settings(BaseSettings):
     dialapi: str
     dial_deployment_name: str = "gpt-4" 
     dial_api_version: str = "2023-12-01-preview" 
+    dial_base_url: str = "https://ai-proxy.lab.epam.com"
+    dial_timeout: float = 60.0  # seconds, covers slow chat completions
+    dial_connect_timeout: float = 5.0
+    dial_max_connections: int = 20
+    dial_max_concurrency: int = 10  # in-flight DIAL requests per process
+    dial_max_retries: int = 3
+    dial_backoff_base: float = 0.5  # seconds, doubled per attempt with full jitter
+    dial_backoff_max: float = 8.0
+    embedding_batch_size: int = 16  # texts per DIAL embeddings request
+    embedding_batch_wait_ms: int = 20  # max wait for a batch to fill
+    embedding_cache_size: int = 2000  # in-process LRU entries in front of the embedding_cache table
+
+    # Auth: verified Firebase ID token cache
+    auth_token_cache_size: int = 10000
+    auth_revocation_check_interval_seconds: float = 60.0
 
     #postgres
     database_url: str
+    database_replica_url: Optional[str] = None  # read-only endpoints use it when set
+    db_echo: bool = False  # logs every statement and its parameters, vectors included
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # seconds before a connection is replaced
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100  # asyncpg prepared statements cached per connection
+
+    # Job recommendations (pgvector ANN)
+    recommendation_mode: str = "ann"  # "ann" uses the vector index, "exact" scores every job
+    recommendation_limit: int = 10
+    vector_index_type: str = "hnsw"  # "hnsw" or "ivfflat"
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 64
+    hnsw_ef_search: int = 40
+    ivfflat_lists: int = 100
+    ivfflat_probes: int = 10
+
+    # Match scores
+    match_score_upsert_chunk_size: int = 5000  # rows per statement, lowered to fit 32767 bind params
+    ranked_candidates_page_size: int = 50
+    ranked_candidates_max_page_size: int = 200
+
+    # Public job list: GET /jobs
+    job_list_page_size: int = 20
+    job_list_max_page_size: int = 100
+    job_list_cache_ttl_seconds: int = 30
+    job_list_cache_size: int = 512  # distinct (filters, cursor, limit) pages kept
+
+    # Semantic candidate search: score = vector weight * similarity + skill weight * skill overlap
+    semantic_search_vector_weight: float = 0.8
+    semantic_search_skill_weight: float = 0.2
+    semantic_search_oversample: int = 4  # ANN pool is this times semantic_search_max_results (at most 1000), re-ranked by the blend
+    semantic_search_max_results: int = 200  # cap on offset + limit
+
+    # Resume upload
+    resume_max_upload_bytes: int = 10 * 1024 * 1024
+    s3_multipart_threshold_bytes: int = 8 * 1024 * 1024
+    s3_multipart_chunksize_bytes: int = 8 * 1024 * 1024
+
+    # Metrics
+    # Metrics are per process: run the API with a single uvicorn worker, extra processes skip exporting
+    metrics_port: int = 9100  # Prometheus endpoint of the API, kept off the public port; 0 disables it
+    worker_metrics_port: int = 9101  # Prometheus endpoint of worker.py, 0 disables it
+
+    # Executors for blocking work (utils/executors.py)
+    io_executor_workers: int = 16  # threads for boto3 / firebase_admin calls
+    cpu_executor_workers: int = 2  # processes for PDF/DOCX extraction
+    executor_kill_grace_seconds: float = 5.0  # past a timed out call's deadline before its pool is recycled
+
+    # Resume text extraction
+    extraction_timeout_seconds: float = 30.0
+    extraction_max_pages: int = 50
+
+    # Background task queue (worker.py)
+    task_worker_concurrency: int = 4
+    task_kind_concurrency: dict[str, int] = {"process_resume": 2, "embed_job": 4, "embed_user": 4, "score_applicants": 1}
+    task_max_attempts: int = 3
+    task_retry_backoff_seconds: int = 30  # doubled per attempt
+    task_lease_seconds: int = 900  # a running task older than this is assumed orphaned and reclaimed
+    task_poll_interval_seconds: float = 1.0
 
     class Config:
         env_file = ".env"  # Load variables from .env file
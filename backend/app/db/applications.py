@@ -0,0 +1,107 @@
+from uuid import UUID
+from sqlalchemy import and_, false, select, true, tuple_, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.application import Application
+from schemas.jobs import JobListing
+from schemas.match_score import MatchScore
+from schemas.user import User
+
+async def create_application(db: AsyncSession, job_id: UUID, uid: str) -> bool:
+    """
+    Record that `uid` applied to `job_id` with a single idempotent insert (not committed).
+
+    Returns False if the application already existed.
+    """
+    stmt = (
+        insert(Application)
+        .values(job_id=job_id, uid=uid)
+        .on_conflict_do_nothing(constraint="uq_application_job_uid")
+        .returning(Application.id)
+    )
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none() is not None
+
+async def get_ranked_applicants(
+    db: AsyncSession,
+    job_id: UUID,
+    recruiter_uid: str,
+    limit: int,
+    after: tuple[float, str] | None = None,
+):
+    """
+    Fetch one page of a job's applicants ranked by match score, in a single query.
+
+    The job row is always returned (LEFT JOIN LATERAL), so the caller can tell a missing job
+    from a job it does not own; applicants are only ranked when `recruiter_uid` owns the job.
+    The page merges two bounded branches: applicants with a score stored from the current
+    embeddings, read in order from ix_match_scores_job_score_uid, and applicants without
+    one, whose score is computed in place as 1 - cosine distance. Pages are keyed on
+    (score, uid), descending.
+
+    Args:
+        db (AsyncSession): Async SQLAlchemy session for PostgreSQL.
+        job_id (UUID): Job whose applicants are ranked.
+        recruiter_uid (str): Caller; must own the job.
+        limit (int): Page size.
+        after (tuple[float, str] | None): (score, uid) of the last row of the previous page.
+
+    Returns:
+        list[Row]: Rows with the job's recruiter_id plus the candidate columns, score and
+        `computed`, telling whether the score is not stored yet (uid is None when there is
+        no candidate on the page).
+    """
+    user_columns = (
+        User.uid, User.full_name, User.email, User.phone_number, User.resume_url,
+        User.key_skills, User.location, User.years_of_experience,
+    )
+    fresh_versions = and_(
+        MatchScore.job_embedding_version == JobListing.embedding_version,
+        MatchScore.user_embedding_version == User.embedding_version,
+    )
+
+    def page_of(stmt, score, uid):
+        stmt = stmt.where(Application.job_id == JobListing.id, JobListing.recruiter_id == recruiter_uid)
+        if after is not None:
+            stmt = stmt.where(tuple_(score, uid) < tuple_(after[0], after[1]))
+        return stmt.order_by(score.desc(), uid.desc()).limit(limit).correlate(JobListing)
+
+    stored = page_of(
+        select(*user_columns, MatchScore.score.label("score"), false().label("computed"))
+        .select_from(MatchScore)
+        .join(Application, and_(Application.job_id == MatchScore.job_id, Application.uid == MatchScore.uid))
+        .join(User, User.uid == MatchScore.uid)
+        .where(fresh_versions),
+        MatchScore.score,
+        MatchScore.uid,
+    )
+    computed_score = 1 - User.embedding.cosine_distance(JobListing.embedding)
+    missing = page_of(
+        select(*user_columns, computed_score.label("score"), true().label("computed"))
+        .select_from(Application)
+        .join(User, User.uid == Application.uid)
+        .outerjoin(
+            MatchScore,
+            and_(MatchScore.job_id == Application.job_id, MatchScore.uid == Application.uid, fresh_versions),
+        )
+        .where(MatchScore.id == None, User.embedding != None, JobListing.embedding != None),
+        computed_score,
+        User.uid,
+    )
+
+    merged = union_all(stored, missing).subquery("merged")
+    candidates = (
+        select(merged)
+        .order_by(merged.c.score.desc(), merged.c.uid.desc())
+        .limit(limit)
+        .lateral("candidates")
+    )
+
+    stmt = (
+        select(JobListing.recruiter_id, candidates)
+        .select_from(JobListing)
+        .outerjoin(candidates, true())
+        .where(JobListing.id == job_id)
+    )
+    result = await db.execute(stmt)
+    return result.fetchall()
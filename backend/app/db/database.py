@@ -1,12 +1,36 @@
+from contextlib import asynccontextmanager
+from fastapi import Depends, Header
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from config.settings import settings
+from db.pool import InstrumentedAsyncPool, get_pool_stats
+from db.vector_type import register_vector_codec
+from utils.metrics import instrument_sqlalchemy_engine
 
 
 DATABASE_URL = settings.database_url
 
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+def create_engine_from_settings(url: str):
+    """Build an async engine with the pool configuration from settings."""
+    async_engine = create_async_engine(
+        url,
+        echo=settings.db_echo,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={"prepared_statement_cache_size": settings.db_statement_cache_size},
+    )
+    event.listen(async_engine.sync_engine, "connect", register_vector_codec)
+    instrument_sqlalchemy_engine(async_engine.sync_engine)
+    return async_engine
+
+
+engine = create_engine_from_settings(DATABASE_URL)
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
@@ -17,8 +41,59 @@ AsyncSessionLocal = sessionmaker(
 )
 
 
+# Optional streaming replica for read-heavy endpoints; without one reads go to the primary
+replica_engine = create_engine_from_settings(settings.database_replica_url) if settings.database_replica_url else None
+
+ReadSessionLocal = sessionmaker(
+    bind=replica_engine or engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+    autocommit=False,
+)
+
+
 Base = declarative_base()
 
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+@asynccontextmanager
+async def task_session():
+    """
+    Session for background work, outside any request.
+
+    Open it around database I/O only and close it before slow external calls (DIAL, S3),
+    so a pooled connection is never parked while a task waits on the network.
+    """
+    async with AsyncSessionLocal() as session:
+        yield session
+
+def read_your_writes(
+    x_read_your_writes: bool = Header(
+        False,
+        description="Send `true` (or 1/yes/on) to read from the primary and bypass caches, "
+        "e.g. right after posting a job; the replica may lag behind it.",
+    )
+) -> bool:
+    """Parsed `X-Read-Your-Writes` header; FastAPI rejects values that are not booleans."""
+    return x_read_your_writes
+
+async def get_read_db(primary: bool = Depends(read_your_writes)):
+    """
+    Session for read-only endpoints, bound to the replica when one is configured.
+
+    The replica may lag behind the primary; a client that must see its own recent write
+    (e.g. a job it just posted) sends `X-Read-Your-Writes: true` to read from the primary.
+    """
+    session_factory = AsyncSessionLocal if primary else ReadSessionLocal
+    async with session_factory() as session:
+        yield session
+
+
+def get_db_pool_stats() -> dict:
+    stats = {"primary": get_pool_stats(engine.pool)}
+    if replica_engine is not None:
+        stats["replica"] = get_pool_stats(replica_engine.pool)
+    return stats
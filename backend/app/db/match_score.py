@@ -1,22 +1,157 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import and_, func, or_, select, true
+from sqlalchemy.dialects.postgresql import insert
+from config.settings import settings
+from schemas.application import Application
 from schemas.match_score import MatchScore
+from schemas.jobs import JobListing
+from schemas.user import User
+from db.vector_search import set_ann_search_params
 import uuid
 
-async def get_existing_scores(uid: str, db: AsyncSession):
-    stmt = select(MatchScore.job_id, MatchScore.score).where(MatchScore.uid == uid)
-    result = await db.execute(stmt)
-    return {str(row.job_id): row.score for row in result.fetchall()}
+POSTGRES_MAX_BIND_PARAMS = 32767
+
+async def upsert_score(db: AsyncSession, uid: str, job_id, score: float, user_version: int | None = None, job_version: int | None = None):
+    await bulk_upsert_scores(db, [(uid, job_id, score, user_version, job_version)])
+
+async def bulk_upsert_scores(db: AsyncSession, rows, chunk_size: int | None = None, commit: bool = True) -> int:
+    """
+    Insert or update many (uid, job_id, score, user_version, job_version) tuples with
+    INSERT ... ON CONFLICT on uq_uid_job.
+
+    The versions are the embedding versions the score was computed from.
+    Each chunk is a single multi-row statement; the transaction is committed once at the end.
+    Returns the number of rows written.
+    """
+    # ON CONFLICT cannot touch the same row twice in one statement, keep the last score per pair
+    latest = {}
+    for uid, job_id, score, user_version, job_version in rows:
+        latest[(uid, str(job_id))] = {
+            "id": uuid.uuid4(),
+            "uid": uid,
+            "job_id": job_id,
+            "score": float(score),
+            "user_embedding_version": user_version,
+            "job_embedding_version": job_version,
+        }
+    # Every writer takes the row locks in (uid, job_id) order, so concurrent upserts of
+    # overlapping pairs wait on each other instead of deadlocking
+    values = [latest[key] for key in sorted(latest)]
+    if not values:
+        return 0
 
-async def upsert_score(db: AsyncSession, uid: str, job_id, score: float):
-    record = MatchScore(
-        id=uuid.uuid4(),
-        uid=uid,
-        job_id=job_id,
-        score=score
+    # asyncpg binds at most 32767 parameters per statement, one per column of each row
+    max_rows = POSTGRES_MAX_BIND_PARAMS // len(values[0])
+    chunk_size = min(chunk_size or settings.match_score_upsert_chunk_size, max_rows)
+    for start in range(0, len(values), chunk_size):
+        stmt = insert(MatchScore).values(values[start:start + chunk_size])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_uid_job",
+            set_={
+                "score": stmt.excluded.score,
+                "user_embedding_version": stmt.excluded.user_embedding_version,
+                "job_embedding_version": stmt.excluded.job_embedding_version,
+            },
+        )
+        await db.execute(stmt)
+
+    if commit:
+        await db.commit()
+    return len(values)
+
+def _scored_pairs():
+    """
+    (id, uid, job_id, score, user_version, job_version) for every embedded candidate and
+    embedded job, scored inside PostgreSQL as 1 - cosine distance; callers narrow it down.
+    """
+    return (
+        select(
+            func.gen_random_uuid(),
+            User.uid,
+            JobListing.id,
+            1 - User.embedding.cosine_distance(JobListing.embedding),
+            User.embedding_version,
+            JobListing.embedding_version,
+        )
+        .select_from(User)
+        .join(JobListing, true())
+        .where(User.embedding != None, JobListing.embedding != None, User.role == "candidate")
     )
-    await db.merge(record)
+
+async def _upsert_scored(db: AsyncSession, scored) -> int:
+    """
+    Upsert the rows of a _scored_pairs() select with one INSERT ... SELECT, so no embedding
+    leaves the database. `scored` must be ordered by (uid, job_id) like bulk_upsert_scores.
+    Commits and returns the number of rows written.
+    """
+    stmt = insert(MatchScore).from_select(
+        ["id", "uid", "job_id", "score", "user_embedding_version", "job_embedding_version"], scored
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_uid_job",
+        set_={
+            "score": stmt.excluded.score,
+            "user_embedding_version": stmt.excluded.user_embedding_version,
+            "job_embedding_version": stmt.excluded.job_embedding_version,
+        },
+    )
+    result = await db.execute(stmt)
     await db.commit()
+    return result.rowcount
+
+async def upsert_scores_for_job(db: AsyncSession, job_id) -> int:
+    """Score one job against every embedded candidate in the database. Returns the rows written."""
+    return await _upsert_scored(db, _scored_pairs().where(JobListing.id == job_id).order_by(User.uid))
+
+async def upsert_scores_for_user(db: AsyncSession, uid: str) -> int:
+    """Score one candidate against every active embedded job in the database. Returns the rows written."""
+    return await _upsert_scored(
+        db,
+        _scored_pairs().where(User.uid == uid, JobListing.is_active == True).order_by(JobListing.id),
+    )
+
+async def upsert_missing_applicant_scores(db: AsyncSession, job_id, limit: int) -> int:
+    """
+    Score up to `limit` applicants of `job_id` whose score is missing or stale, in the database.
+    Returns the rows written; fewer than `limit` means none are left.
+    """
+    scored = (
+        _scored_pairs()
+        .join(Application, and_(Application.uid == User.uid, Application.job_id == JobListing.id))
+        .outerjoin(
+            MatchScore,
+            and_(
+                MatchScore.job_id == JobListing.id,
+                MatchScore.uid == User.uid,
+                MatchScore.job_embedding_version == JobListing.embedding_version,
+                MatchScore.user_embedding_version == User.embedding_version,
+            ),
+        )
+        .where(JobListing.id == job_id, MatchScore.id == None)
+        .order_by(User.uid)
+        .limit(limit)
+    )
+    return await _upsert_scored(db, scored)
+
+async def get_jobs_needing_scores(uid: str, user_version: int, db: AsyncSession):
+    """
+    Return (job_id, embedding, embedding_version) for embedded jobs whose score for `uid`
+    is missing or was computed from an older user or job embedding.
+    """
+    stmt = (
+        select(JobListing.id, JobListing.embedding, JobListing.embedding_version)
+        .outerjoin(MatchScore, and_(MatchScore.job_id == JobListing.id, MatchScore.uid == uid))
+        .where(
+            JobListing.embedding != None,
+            or_(
+                MatchScore.id == None,
+                MatchScore.user_embedding_version.is_distinct_from(user_version),
+                MatchScore.job_embedding_version.is_distinct_from(JobListing.embedding_version),
+            ),
+        )
+    )
+    result = await db.execute(stmt)
+    return result.fetchall()
 
 async def get_top_jobs(uid: str, db: AsyncSession, limit: int = 10):
     stmt = (
@@ -27,3 +162,19 @@ async def get_top_jobs(uid: str, db: AsyncSession, limit: int = 10):
     )
     result = await db.execute(stmt)
     return result.all()
+
+async def get_nearest_jobs(user_emb, db: AsyncSession, limit: int = 10):
+    """
+    Return the `limit` closest jobs to `user_emb` as (job_id, cosine similarity, embedding_version),
+    using the ANN index.
+    """
+    await set_ann_search_params(db, limit)
+    distance = JobListing.embedding.cosine_distance(user_emb)
+    stmt = (
+        select(JobListing.id, (1 - distance).label("score"), JobListing.embedding_version)
+        .where(JobListing.embedding != None)
+        .order_by(distance)
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return [(row.id, float(row.score), row.embedding_version) for row in result.all()]
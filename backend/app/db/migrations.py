@@ -0,0 +1,118 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Ordered, append-only list of (migration id, statements).
+# Base.metadata.create_all only creates missing tables, so anything touching
+# existing tables (indexes, new columns, data moves) goes here.
+MIGRATIONS: list[tuple[str, list[str]]] = [
+    (
+        "0001_match_score_lookup_indexes",
+        [
+            "CREATE INDEX IF NOT EXISTS ix_match_scores_uid_score ON match_scores (uid, score DESC)",
+            "CREATE INDEX IF NOT EXISTS ix_match_scores_job_id_score ON match_scores (job_id, score DESC)",
+        ],
+    ),
+    (
+        "0002_embedding_versions",
+        [
+            "ALTER TABLE users ADD COLUMN IF NOT EXISTS embedding_version INTEGER NOT NULL DEFAULT 0",
+            "ALTER TABLE job_listings ADD COLUMN IF NOT EXISTS embedding_version INTEGER NOT NULL DEFAULT 0",
+            # Existing scores have no versions and are therefore recomputed on next read
+            "ALTER TABLE match_scores ADD COLUMN IF NOT EXISTS user_embedding_version INTEGER",
+            "ALTER TABLE match_scores ADD COLUMN IF NOT EXISTS job_embedding_version INTEGER",
+        ],
+    ),
+    (
+        "0003_resume_upload_content_hash",
+        [
+            "ALTER TABLE resume_uploads ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)",
+        ],
+    ),
+    (
+        "0004_applications_from_applied_user_ids",
+        [
+            # Applicants whose user row no longer exists are dropped (FK on applications.uid)
+            "INSERT INTO applications (id, job_id, uid) "
+            "SELECT gen_random_uuid(), j.id, a.uid "
+            "FROM job_listings j "
+            "CROSS JOIN LATERAL unnest(j.applied_user_ids) AS a(uid) "
+            "JOIN users u ON u.uid = a.uid "
+            "ON CONFLICT ON CONSTRAINT uq_application_job_uid DO NOTHING",
+        ],
+    ),
+    (
+        "0005_candidate_search_indexes",
+        [
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            "ALTER TABLE users ADD COLUMN IF NOT EXISTS skill_tokens VARCHAR[] NOT NULL DEFAULT '{}'",
+            # Same normalization as schemas.user.normalize_skill_tokens
+            "UPDATE users SET skill_tokens = ARRAY("
+            "SELECT t.token FROM ("
+            "SELECT lower(btrim(s.skill)) AS token, min(s.ord) AS ord "
+            "FROM unnest(key_skills) WITH ORDINALITY AS s(skill, ord) "
+            "WHERE btrim(s.skill) <> '' GROUP BY 1"
+            ") t ORDER BY t.ord)",
+            "CREATE INDEX IF NOT EXISTS ix_users_skill_tokens ON users USING gin (skill_tokens)",
+            "CREATE INDEX IF NOT EXISTS ix_users_location_trgm ON users USING gin (lower(location) gin_trgm_ops)",
+            "CREATE INDEX IF NOT EXISTS ix_users_years_of_experience ON users (years_of_experience)",
+        ],
+    ),
+    (
+        "0006_job_listing_pagination",
+        [
+            # Existing rows all get the migration time; ids break the tie for keyset pagination
+            "ALTER TABLE job_listings ADD COLUMN IF NOT EXISTS created_at TIMESTAMP NOT NULL DEFAULT now()",
+            "ALTER TABLE job_listings ADD COLUMN IF NOT EXISTS skill_tokens VARCHAR[] NOT NULL DEFAULT '{}'",
+            "UPDATE job_listings SET skill_tokens = ARRAY("
+            "SELECT t.token FROM ("
+            "SELECT lower(btrim(s.skill)) AS token, min(s.ord) AS ord "
+            "FROM unnest(key_skills) WITH ORDINALITY AS s(skill, ord) "
+            "WHERE btrim(s.skill) <> '' GROUP BY 1"
+            ") t ORDER BY t.ord)",
+            "CREATE INDEX IF NOT EXISTS ix_job_listings_active_created_at "
+            "ON job_listings (created_at DESC, id DESC) WHERE is_active",
+            "CREATE INDEX IF NOT EXISTS ix_job_listings_skill_tokens ON job_listings USING gin (skill_tokens)",
+            "CREATE INDEX IF NOT EXISTS ix_job_listings_location_trgm ON job_listings USING gin (lower(location) gin_trgm_ops)",
+        ],
+    ),
+    (
+        "0007_ranked_applicants_keyset",
+        [
+            # Applicant ranking pages through stored scores in (score, uid) order
+            "CREATE INDEX IF NOT EXISTS ix_match_scores_job_score_uid "
+            "ON match_scores (job_id, score DESC, uid DESC)",
+        ],
+    ),
+    (
+        "0008_embedding_text_hash",
+        [
+            # NULL for existing rows, so each is re-embedded once on its next save
+            "ALTER TABLE users ADD COLUMN IF NOT EXISTS embedding_text_hash VARCHAR(64)",
+            "ALTER TABLE job_listings ADD COLUMN IF NOT EXISTS embedding_text_hash VARCHAR(64)",
+        ],
+    ),
+]
+
+
+async def run_migrations(conn: AsyncConnection):
+    """Apply every migration not yet recorded in schema_migrations, in order."""
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "id VARCHAR(255) PRIMARY KEY, "
+        "applied_at TIMESTAMP NOT NULL DEFAULT now())"
+    ))
+    result = await conn.execute(text("SELECT id FROM schema_migrations"))
+    applied = {row.id for row in result}
+
+    for migration_id, statements in MIGRATIONS:
+        if migration_id in applied:
+            continue
+        for statement in statements:
+            await conn.execute(text(statement))
+        await conn.execute(
+            text("INSERT INTO schema_migrations (id) VALUES (:id)"), {"id": migration_id}
+        )
+        logger.info(f"Applied migration {migration_id}")
@@ -6,6 +6,7 @@ from pymongo import server_api
 from pymongo import AsyncMongoClient
 
 from utils.logger import setup_logger  
+from utils.metrics import MongoCommandMetrics
 logger = setup_logger()
 
 load_dotenv()
@@ -15,7 +16,8 @@ MONGODB_URI = os.getenv("MONGODB_URI")
 
 mongo_client: AsyncMongoClient = AsyncMongoClient(
     MONGODB_URI,
-    server_api=server_api.ServerApi(version="1", strict=True, deprecation_errors=True)
+    server_api=server_api.ServerApi(version="1", strict=True, deprecation_errors=True),
+    event_listeners=[MongoCommandMetrics()],
 )
 
 async def ping_db():
@@ -0,0 +1,45 @@
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = {"checkouts": 0, "timeouts": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0}
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_stats["timeouts"] += 1
+            raise
+        finally:
+            # Includes opening a new connection when the pool grows
+            wait_ms = (time.perf_counter() - start) * 1000
+            self.checkout_stats["checkouts"] += 1
+            self.checkout_stats["wait_ms_total"] += wait_ms
+            self.checkout_stats["wait_ms_max"] = max(self.checkout_stats["wait_ms_max"], wait_ms)
+
+
+def get_pool_stats(pool) -> dict:
+    """Occupancy of a pool, plus checkout wait times when it is an InstrumentedAsyncPool."""
+    stats = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+    checkout_stats = getattr(pool, "checkout_stats", None)
+    if checkout_stats is not None:
+        checkouts = checkout_stats["checkouts"]
+        stats.update(
+            checkouts=checkouts,
+            timeouts=checkout_stats["timeouts"],
+            wait_ms_avg=round(checkout_stats["wait_ms_total"] / checkouts, 3) if checkouts else 0.0,
+            wait_ms_max=round(checkout_stats["wait_ms_max"], 3),
+        )
+    return stats
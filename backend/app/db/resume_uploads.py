@@ -0,0 +1,41 @@
+from uuid import UUID
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import task_session
+from schemas.resume_upload import ResumeUpload
+
+TERMINAL_STATUSES = {"saved", "failed"}
+
+async def create_resume_upload(
+    db: AsyncSession,
+    uid: str,
+    s3_key: str,
+    content_type: str,
+    stage_timings: dict,
+    content_hash: str | None = None,
+    status: str = "queued",
+) -> ResumeUpload:
+    """Add an upload record to the caller's transaction (not committed)."""
+    upload = ResumeUpload(
+        uid=uid,
+        s3_key=s3_key,
+        content_type=content_type,
+        content_hash=content_hash,
+        status=status,
+        stage_timings=stage_timings,
+    )
+    db.add(upload)
+    await db.flush()
+    return upload
+
+async def set_resume_upload_status(upload_id: UUID, status: str, stage_timings: dict | None = None, error: str | None = None):
+    """Record a pipeline state change in its own short transaction."""
+    values = {"status": status, "error": error}
+    if stage_timings is not None:
+        values["stage_timings"] = stage_timings
+    async with task_session() as db:
+        await db.execute(update(ResumeUpload).where(ResumeUpload.id == upload_id).values(**values))
+        await db.commit()
+
+async def get_resume_upload(db: AsyncSession, upload_id: UUID) -> ResumeUpload | None:
+    return await db.get(ResumeUpload, upload_id)
@@ -0,0 +1,134 @@
+from uuid import UUID
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.settings import settings
+from schemas.task import Task
+
+async def enqueue_task(
+    db: AsyncSession,
+    kind: str,
+    payload: dict,
+    owner_uid: str | None = None,
+    max_attempts: int | None = None,
+    commit: bool = True,
+) -> UUID:
+    """
+    Add a task to the queue and return its id.
+
+    Pass commit=False to enqueue in the caller's transaction, so the task only
+    becomes visible if the write it belongs to commits.
+    """
+    task = Task(
+        kind=kind,
+        payload=payload,
+        owner_uid=owner_uid,
+        max_attempts=max_attempts or settings.task_max_attempts,
+    )
+    db.add(task)
+    await db.flush()
+    if commit:
+        await db.commit()
+    return task.id
+
+async def has_pending_task(db: AsyncSession, kind: str, payload: dict) -> bool:
+    """True if a queued or running task of `kind` has a payload containing `payload`."""
+    result = await db.execute(
+        select(Task.id)
+        .where(Task.kind == kind, Task.status.in_(("queued", "running")), Task.payload.contains(payload))
+        .limit(1)
+    )
+    return result.scalar_one_or_none() is not None
+
+def _lease_expired():
+    return Task.locked_at < func.now() - func.make_interval(0, 0, 0, 0, 0, 0, settings.task_lease_seconds)
+
+async def claim_tasks(db: AsyncSession, kind: str, limit: int) -> list[Task]:
+    """
+    Atomically claim up to `limit` runnable tasks of `kind` with FOR UPDATE SKIP LOCKED.
+
+    Runnable means queued and due, or running with an expired lease (the worker died)
+    and attempts left. Running workers keep their lease alive with `renew_lease`.
+    """
+    if limit <= 0:
+        return []
+
+    runnable = (
+        select(Task.id)
+        .where(
+            Task.kind == kind,
+            or_(
+                and_(Task.status == "queued", Task.run_after <= func.now()),
+                and_(Task.status == "running", _lease_expired(), Task.attempts < Task.max_attempts),
+            ),
+        )
+        .order_by(Task.run_after)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(Task)
+        .where(Task.id.in_(runnable.scalar_subquery()))
+        .values(status="running", attempts=Task.attempts + 1, locked_at=func.now())
+        .returning(Task)
+    )
+    tasks = list(result.scalars().all())
+    await db.commit()
+    return tasks
+
+async def expire_exhausted_tasks(db: AsyncSession, kind: str) -> list[Task]:
+    """
+    Mark failed the running tasks of `kind` whose lease expired on their last attempt
+    (the worker died during it), instead of running them past max_attempts.
+    """
+    result = await db.execute(
+        update(Task)
+        .where(
+            Task.kind == kind,
+            Task.status == "running",
+            _lease_expired(),
+            Task.attempts >= Task.max_attempts,
+        )
+        .values(status="failed", locked_at=None, last_error="Lease expired during the final attempt")
+        .returning(Task)
+    )
+    tasks = list(result.scalars().all())
+    await db.commit()
+    return tasks
+
+async def renew_lease(db: AsyncSession, task_id: UUID):
+    """Heartbeat from the worker running the task, so it is not reclaimed while still running."""
+    await db.execute(
+        update(Task)
+        .where(Task.id == task_id, Task.status == "running")
+        .values(locked_at=func.now())
+    )
+    await db.commit()
+
+async def complete_task(db: AsyncSession, task_id: UUID):
+    await db.execute(
+        update(Task)
+        .where(Task.id == task_id)
+        .values(status="succeeded", locked_at=None, last_error=None)
+    )
+    await db.commit()
+
+async def fail_task(db: AsyncSession, task: Task, error: str):
+    """Requeue with exponential backoff, or mark failed once max_attempts is reached."""
+    if task.attempts < task.max_attempts:
+        delay = settings.task_retry_backoff_seconds * 2 ** (task.attempts - 1)
+        values = dict(
+            status="queued",
+            run_after=func.now() + func.make_interval(0, 0, 0, 0, 0, 0, delay),
+        )
+    else:
+        values = dict(status="failed")
+
+    await db.execute(
+        update(Task)
+        .where(Task.id == task.id)
+        .values(locked_at=None, last_error=error[:4000], **values)
+    )
+    await db.commit()
+
+async def get_task(db: AsyncSession, task_id: UUID) -> Task | None:
+    return await db.get(Task, task_id)
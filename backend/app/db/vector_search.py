@@ -0,0 +1,49 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from config.settings import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Tables whose `embedding` column gets an ANN index at startup
+VECTOR_INDEXED_TABLES = ["job_listings", "users"]
+
+
+def _vector_index_ddl(table: str) -> str:
+    """Build the CREATE INDEX statement for the configured index type."""
+    if settings.vector_index_type == "ivfflat":
+        return (
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_embedding_ivfflat "
+            f"ON {table} USING ivfflat (embedding vector_cosine_ops) "
+            f"WITH (lists = {int(settings.ivfflat_lists)})"
+        )
+    return (
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_embedding_hnsw "
+        f"ON {table} USING hnsw (embedding vector_cosine_ops) "
+        f"WITH (m = {int(settings.hnsw_m)}, ef_construction = {int(settings.hnsw_ef_construction)})"
+    )
+
+
+async def create_vector_indexes(conn: AsyncConnection):
+    """Create cosine ANN indexes on every embedding column (idempotent)."""
+    for table in VECTOR_INDEXED_TABLES:
+        await conn.execute(text(_vector_index_ddl(table)))
+        logger.info(f"{settings.vector_index_type} index ready on {table}.embedding")
+
+
+# Largest hnsw.ef_search pgvector accepts
+HNSW_MAX_EF_SEARCH = 1000
+
+
+async def set_ann_search_params(db: AsyncSession, limit: int):
+    """
+    Tune the ANN search for the current transaction.
+
+    HNSW never returns more rows than ef_search, so it is raised to at least `limit`,
+    up to the pgvector maximum of HNSW_MAX_EF_SEARCH.
+    """
+    if settings.vector_index_type == "ivfflat":
+        await db.execute(text(f"SET LOCAL ivfflat.probes = {int(settings.ivfflat_probes)}"))
+    else:
+        ef_search = min(max(int(settings.hnsw_ef_search), int(limit)), HNSW_MAX_EF_SEARCH)
+        await db.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
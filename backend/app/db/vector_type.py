@@ -0,0 +1,46 @@
+from pgvector import Vector as PgVector
+from pgvector.asyncpg import register_vector
+from pgvector.sqlalchemy import VECTOR
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class Vector(VECTOR):
+    """
+    pgvector column type that uses the binary wire format on asyncpg.
+
+    The stock type renders every value as a '[0.1,0.2,...]' string. On asyncpg the value is
+    handed over as a pgvector Vector instead, and the codec installed by `register_vector_codec`
+    encodes it as packed float32; results come back as float32 numpy arrays. Other drivers keep
+    the text format.
+    """
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        if dialect.driver != "asyncpg":
+            return super().bind_processor(dialect)
+
+        dim = self.dim
+
+        def process(value):
+            if value is None:
+                return None
+            vector = value if isinstance(value, PgVector) else PgVector(value)
+            if dim is not None and vector.dimensions() != dim:
+                raise ValueError(f"expected {dim} dimensions, not {vector.dimensions()}")
+            return vector
+        return process
+
+
+def register_vector_codec(dbapi_connection, connection_record):
+    """
+    `connect` event handler installing the binary pgvector codec on a new asyncpg connection.
+
+    Before `CREATE EXTENSION vector` has run the type does not exist yet; that connection
+    keeps the default codecs and the caller disposes the pool once the extension is created.
+    """
+    try:
+        dbapi_connection.run_async(register_vector)
+    except ValueError as e:
+        logger.warning(f"pgvector codec not registered on new connection: {e}")
@@ -1,16 +1,27 @@
 import os
+import time
 from sqlalchemy import text
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from contextlib import asynccontextmanager
 from routers import upload, users, jobs
 from routers.auth import router as auth_router
 from config.settings import settings
+from config.s3_client import RESUME_BUCKET_NAME, create_bucket_if_not_exists
 from db.database import Base, engine  
+from db.vector_search import create_vector_indexes
+from db.migrations import run_migrations
 from db.mongo import ping_db  
+from services.resume_service import ensure_parse_cache_index
 from utils.logger import setup_logger
+from utils.dial_client import dial_client
+from utils.embedding_batcher import embedding_batcher
+from utils.executors import run_io, shutdown_executors
 from routers import match_score
 from routers import search
+from routers import tasks
+from utils.metrics import HTTP_REQUEST_DURATION, serve_metrics
+from services.stats_service import register_stats_collector
 
 logger = setup_logger()
 
@@ -24,13 +35,40 @@ async def lifespan(app: FastAPI):
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector;"))
         
         await conn.run_sync(Base.metadata.create_all)
+        await run_migrations(conn)
+    # Connections opened before the extension existed have no binary vector codec
+    await engine.dispose()
     logger.info("PostgreSQL tables and pgvector extension ready.")
+
+    # Separate transaction: a failed index build (e.g. old pgvector without HNSW)
+    # must not roll back the schema; recommendations fall back to an exact scan.
+    try:
+        async with engine.begin() as conn:
+            await create_vector_indexes(conn)
+    except Exception as e:
+        logger.warning(f"Vector index creation failed, ANN search will not use an index: {e}")
     
     await ping_db()
+    try:
+        await ensure_parse_cache_index()
+    except Exception as e:
+        logger.warning(f"Could not create resume parse cache index: {e}")
+    try:
+        await run_io(create_bucket_if_not_exists, RESUME_BUCKET_NAME)
+    except Exception as e:
+        logger.warning(f"Could not verify S3 bucket {RESUME_BUCKET_NAME}: {e}")
+    await dial_client.start()
+    await embedding_batcher.start()
+    # Scraped on a separate port that is not exposed publicly, like the worker's
+    if settings.metrics_port and serve_metrics(settings.metrics_port, "API"):
+        register_stats_collector()
 
     logger.info("Hire-archy backend started successfully.")
     yield
     logger.info("Hire-archy backend is shutting down.")
+    await embedding_batcher.close()
+    await dial_client.close()
+    shutdown_executors()
 
 
 app = FastAPI(
@@ -52,14 +90,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  
     allow_headers=["*"],  
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Observe request latency labelled by route template (not raw path) and status code."""
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.labels(
+            request.method,
+            route.path if route is not None else "unmatched",
+            str(status_code),
+        ).observe(time.perf_counter() - started)
+
 app.include_router(auth_router)
 app.include_router(users.router)
 app.include_router(upload.router, tags=["Resume Upload"])
 app.include_router(jobs.router, tags = ["Jobs"])
 app.include_router(match_score.router)
 app.include_router(search.router)
+app.include_router(tasks.router)
 
 @app.get("/", tags=["Public"])
 async def read_root():
@@ -32,6 +32,7 @@ class JobListingOut(BaseModel):
     is_active: bool
     recruiter_id: str
     job_summary: Optional[str]
+    created_at: Optional[datetime] = None
 
     class Config:
         orm_mode = True
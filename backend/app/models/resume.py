@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+class ResumeUploadStatusOut(BaseModel):
+    id: UUID
+    status: str
+    stage_timings: dict[str, float]
+    error: Optional[str] = None
+    task_id: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
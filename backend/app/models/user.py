@@ -25,4 +25,9 @@ class UserProfileResponse(BaseModel):
 class CandidateSearchResponse(UserProfileResponse):
     location: Optional[str] = None
     years_of_experience: Optional[int] = None
-    key_skills: Optional[list[str]] = None
\ No newline at end of file
+    key_skills: Optional[list[str]] = None
+
+class SemanticCandidateSearchResponse(CandidateSearchResponse):
+    score: float
+    similarity: float
+    skill_overlap: float
\ No newline at end of file
@@ -6,6 +6,8 @@ from models.auth import LoginSchema, SignUpSchema, UserSignupResponse
 from services.firebase_service import signup_candidate_service, login_service
 from sqlalchemy.ext.asyncio import AsyncSession
 from firebase_admin import auth
+from utils.executors import run_io
+from utils.metrics import timed_dependency
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -26,7 +28,7 @@ async def login(user_data: LoginSchema = Body(...)):
 @router.post("/verify-token")
 async def verify_token(token: str = Body(..., embed=True)):
     try:
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = await run_io(timed_dependency("firebase", "verify_id_token", auth.verify_id_token), token)
         return {
             "valid": True,
             "uid": decoded_token.get("uid"),
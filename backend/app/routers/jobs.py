@@ -1,20 +1,24 @@
-from sqlalchemy import desc, select, update 
+from sqlalchemy import select
+from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID, uuid4
 
 # Dependencies and utilities
-from schemas.user import User
-from schemas.match_score import MatchScore
 from config.firebase import get_current_user  
 from schemas.jobs import JobListing  
-from services.jobs_service import store_job_summary_embedding 
-from db.database import get_db  
+from services.tasks import TASK_EMBED_JOB, TASK_SCORE_APPLICANTS
+from db.task_queue import enqueue_task, has_pending_task
+from services.jobs_service import get_job_list_page, invalidate_job_list_cache
+from db.applications import create_application, get_ranked_applicants
+from db.database import AsyncSessionLocal, get_db, get_read_db, read_your_writes
 from models.job import JobListingCreate, JobListingOut  
 from utils.dial_parser import get_text_embedding  
 from db.mongo import get_mongo_client  
 from utils.logger import setup_logger
+from utils.pagination import decode_cursor, encode_cursor
+from config.settings import settings
 
 router = APIRouter()
 logger = setup_logger(__name__)
@@ -22,7 +26,6 @@ logger = setup_logger(__name__)
 @router.post("/jobs", response_model=JobListingOut, status_code=status.HTTP_201_CREATED)
 async def create_job_listing(
     job: JobListingCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
@@ -57,21 +60,62 @@ async def create_job_listing(
     )
 
     db.add(new_job)
+    # Enqueued in the same transaction: the embedding task exists iff the job does
+    await enqueue_task(
+        db,
+        TASK_EMBED_JOB,
+        {"job_id": str(new_job.id), "summary_text": summary_text},
+        owner_uid=current_user["uid"],
+        commit=False,
+    )
     await db.commit()
     await db.refresh(new_job)
-
-    # Add background task with db
-    background_tasks.add_task(store_job_summary_embedding, new_job.id, summary_text, db)
+    invalidate_job_list_cache()
 
     return new_job
 
 @router.get("/jobs", response_model=List[JobListingOut])
 async def get_all_jobs(
-    db: AsyncSession = Depends(get_db)
+    limit: int = Query(settings.job_list_page_size, ge=1, le=settings.job_list_max_page_size),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    location: Optional[str] = None,
+    skills: Optional[List[str]] = Query(None),
+    max_experience: Optional[int] = Query(None, ge=0, description="Only jobs requiring at most this many years"),
+    company: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    primary: bool = Depends(read_your_writes),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    result = await db.execute(select(JobListing).where(JobListing.is_active == True))
-    jobs = result.scalars().all()
-    return jobs
+    after = None
+    if cursor:
+        try:
+            created_at, job_id = decode_cursor(cursor, (str, str))
+            after = (datetime.fromisoformat(created_at), UUID(job_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    skills = sorted({skill.strip().lower() for skill in skills or [] if skill.strip()})
+    cache_key = (
+        cursor, limit,
+        (location or "").lower(), tuple(skills), max_experience, (company or "").lower(),
+    )
+    # Read-your-writes requests skip the cache as well as the replica
+    page = await get_job_list_page(
+        db, None if primary else cache_key,
+        limit=limit, after=after, location=location, skills=skills,
+        max_experience=max_experience, company=company,
+    )
+
+    headers = {
+        "ETag": page["etag"],
+        "Cache-Control": f"public, max-age={settings.job_list_cache_ttl_seconds}",
+    }
+    if page["next_cursor"]:
+        headers["X-Next-Cursor"] = encode_cursor(page["next_cursor"])
+
+    if if_none_match and page["etag"] in {tag.strip() for tag in if_none_match.split(",")}:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=page["body"], media_type="application/json", headers=headers)
 
 #  GET jobs posted by currently logged-in recruiter
 @router.get("/jobs/recruiter", response_model=List[JobListingOut])
@@ -117,35 +161,29 @@ async def apply_to_job(
         logger.warning(f"Unauthorized apply attempt by user {uid} with role {current_user['role']}")
         raise HTTPException(status_code=403, detail="Only candidates can apply to jobs.")
 
-    # Fetch job by ID
-    result = await db.execute(select(JobListing).where(JobListing.id == job_id))
-    job = result.scalar_one_or_none()
-
-    if not job:
+    # Check the job exists
+    result = await db.execute(select(JobListing.id).where(JobListing.id == job_id))
+    if result.scalar_one_or_none() is None:
         logger.warning(f"Job with ID {job_id} not found.")
         raise HTTPException(status_code=404, detail="Job not found")
 
-    if uid in job.applied_user_ids:
+    # One idempotent insert; the unique (job_id, uid) constraint settles concurrent applies
+    created = await create_application(db, job_id, uid)
+    await db.commit()
+
+    if not created:
         logger.info(f"User {uid} has already applied to job {job_id}")
         raise HTTPException(status_code=400, detail="Already applied to this job")
 
-    # Add UID to applied_user_ids
-    updated_applied_ids = job.applied_user_ids + [uid]
-
-    await db.execute(
-        update(JobListing)
-        .where(JobListing.id == job_id)
-        .values(applied_user_ids=updated_applied_ids)
-    )
-    await db.commit()
-
     logger.info(f"User {uid} successfully applied to job {job_id}")
     return {"message": "Application successful"}
 
 @router.get("/ranked-candidates")
 async def rank_candidates(
     job_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    limit: int = Query(settings.ranked_candidates_page_size, ge=1, le=settings.ranked_candidates_max_page_size),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     # Access Control
@@ -153,62 +191,58 @@ async def rank_candidates(
         logger.warning(f"Unauthorized access attempt by user {current_user['uid']}")
         raise HTTPException(status_code=403, detail="Only recruiters can access candidate rankings.")
 
-    # Step 1: Fetch job and validate recruiter ownership
-    job_result = await db.execute(select(JobListing).where(JobListing.id == job_id))
-    job = job_result.scalar_one_or_none()
+    after = None
+    if cursor:
+        try:
+            score, uid = decode_cursor(cursor, ((int, float), str))
+            after = (float(score), str(uid))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    if not job:
+    # Step 1: Ownership check, scoring and ranked page in one query (one extra row to detect a next page)
+    rows = await get_ranked_applicants(db, job_id, current_user["uid"], limit + 1, after)
+
+    if not rows:
         logger.warning(f"Job with ID {job_id} not found.")
         raise HTTPException(status_code=404, detail="Job not found")
 
-    if job.recruiter_id != current_user["uid"]:
+    if rows[0].recruiter_id != current_user["uid"]:
         logger.warning(f"Recruiter {current_user['uid']} tried to access unauthorized job {job_id}")
         raise HTTPException(status_code=403, detail="Access denied. You do not own this job.")
 
-    if not job.applied_user_ids:
-        logger.info(f"No users have applied to job {job_id}")
-        return {"candidates": []}
-
-    # Step 2: Fetch match scores
-    scores_result = await db.execute(
-        select(MatchScore.uid, MatchScore.score)
-        .where(
-            MatchScore.job_id == job_id,
-            MatchScore.uid.in_(job.applied_user_ids)
-        )
-        .order_by(desc(MatchScore.score))
-    )
-    score_data = scores_result.fetchall()
-
-    if not score_data:
-        logger.info(f"No match scores found for job {job_id}")
-        return {"candidates": []}
-
-    # Step 3: Fetch user details
-    uids = [uid for uid, _ in score_data]
-    users_result = await db.execute(
-        select(User.uid, User.full_name, User.email, User.phone_number, User.resume_url,
-               User.key_skills, User.location, User.years_of_experience)
-        .where(User.uid.in_(uids))
-    )
-    users = {user.uid: user for user in users_result.fetchall()}
-
-    # Step 4: Combine
-    ranked_candidates = []
-    for uid, score in score_data:
-        user = users.get(uid)
-        if user:
-            ranked_candidates.append({
-                "uid": uid,
-                "score": round(score, 4),
-                "full_name": user.full_name,
-                "email": user.email,
-                "phone_number": user.phone_number,
-                "resume_url": user.resume_url,
-                "key_skills": user.key_skills,
-                "location": user.location,
-                "years_of_experience": user.years_of_experience,
-            })
+    rows = [row for row in rows if row.uid is not None]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if not rows:
+        logger.info(f"No ranked candidates for job {job_id}")
+        return {"candidates": [], "next_cursor": None}
+
+    # Step 2: Scores computed in place are stored by the worker, so later reads take the indexed path
+    if any(row.computed for row in rows):
+        # `db` may be the read replica, writes go to the primary
+        async with AsyncSessionLocal() as write_db:
+            payload = {"job_id": str(job_id)}
+            if not await has_pending_task(write_db, TASK_SCORE_APPLICANTS, payload):
+                await enqueue_task(write_db, TASK_SCORE_APPLICANTS, payload)
+                logger.info(f"Queued storing of computed applicant scores for job {job_id}")
+
+    # Step 3: Combine
+    ranked_candidates = [
+        {
+            "uid": row.uid,
+            "score": round(row.score, 4),
+            "full_name": row.full_name,
+            "email": row.email,
+            "phone_number": row.phone_number,
+            "resume_url": row.resume_url,
+            "key_skills": row.key_skills,
+            "location": row.location,
+            "years_of_experience": row.years_of_experience,
+        }
+        for row in rows
+    ]
+    next_cursor = encode_cursor([rows[-1].score, rows[-1].uid]) if has_more else None
 
     logger.info(f"{len(ranked_candidates)} ranked candidates returned for job {job_id}")
-    return {"candidates": ranked_candidates}
\ No newline at end of file
+    return {"candidates": ranked_candidates, "next_cursor": next_cursor}
@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from config.firebase import get_current_user
 from db.database import get_db
 from services.match_score_service import recommend_jobs
 from models.match_score import MatchScoreOut
+from utils.logger import setup_logger
 
 router = APIRouter(prefix="/match-scores", tags=["Match Scores"])
+logger = setup_logger(__name__)
 
 @router.get("/recommendations/{uid}", response_model=list[MatchScoreOut])
-async def get_recommendations(current_user: dict = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def get_recommendations(
+    mode: Optional[Literal["ann", "exact"]] = Query(None, description="Override the configured recommendation mode"),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
     role = current_user.get("role")
     if role != "candidate":
         raise HTTPException(
@@ -18,8 +25,8 @@ async def get_recommendations(current_user: dict = Depends(get_current_user), db
     
     try:
         uid=current_user.get("uid", "N/A")
-        results = await recommend_jobs(uid, db)
-        print(results)
+        results = await recommend_jobs(uid, db, mode=mode)
+        logger.debug(f"Recommendations for UID {uid}: {results}")
         return [{"job_id": job_id, "score": score} for job_id, score in results]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,18 +1,89 @@
-from fastapi import APIRouter, Depends, Query
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Literal, Optional
+from uuid import UUID
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.database import get_db
-from services.search import filter_candidates
-from models.user import CandidateSearchResponse
+from config.firebase import get_current_user
+from db.database import get_read_db
+from schemas.jobs import JobListing
+from services.embedding_service import get_embedding
+from services.search import filter_candidates, semantic_search_candidates
+from models.user import CandidateSearchResponse, SemanticCandidateSearchResponse
+from utils.logger import setup_logger
 
 router = APIRouter(prefix="/candidates", tags=["Candidates"])
+logger = setup_logger(__name__)
 
 @router.get("/", response_model=List[CandidateSearchResponse])
 async def get_candidates_by_filters(
     skills: Optional[List[str]] = Query(None),
     location: Optional[str] = None,
     min_experience: Optional[int] = None,
-    db: AsyncSession = Depends(get_db),
+    match_mode: Literal["all", "any"] = Query("all", description="Require all skills or at least one"),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    return await filter_candidates(skills, location, min_experience, db)
+    return await filter_candidates(skills, location, min_experience, db, match_mode)
+
+@router.get("/semantic", response_model=List[SemanticCandidateSearchResponse])
+async def semantic_candidate_search(
+    q: Optional[str] = Query(None, description="Free-text description of the candidate"),
+    job_id: Optional[UUID] = Query(None, description="Search candidates for this job instead of `q`"),
+    skills: Optional[List[str]] = Query(None, description="Skills for the overlap score; defaults to the job's skills"),
+    location: Optional[str] = None,
+    min_experience: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user),
+):
+    if current_user.get("role") != "recruiter":
+        raise HTTPException(status_code=403, detail="Only recruiters can search candidates.")
+
+    if (q is None) == (job_id is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of `q` or `job_id`.")
+
+    if job_id is not None:
+        result = await db.execute(
+            select(JobListing.embedding, JobListing.job_summary, JobListing.key_skills)
+            .where(JobListing.id == job_id)
+        )
+        job = result.one_or_none()
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if job.embedding is not None:
+            query_embedding = job.embedding
+        elif job.job_summary:
+            # Job embedding still queued, embed its summary through the same cache
+            query_embedding = await get_embedding(job.job_summary)
+        else:
+            raise HTTPException(status_code=409, detail="Job has no embedding yet")
+        skills = skills or job.key_skills
+    else:
+        if not q.strip():
+            raise HTTPException(status_code=400, detail="`q` must not be empty.")
+        query_embedding = await get_embedding(q)
+
+    ranked = await semantic_search_candidates(
+        query_embedding, skills, location, min_experience, db, limit=limit, offset=offset
+    )
+    logger.info(f"Semantic search returned {len(ranked)} candidates for recruiter {current_user['uid']}")
+
+    return [
+        {
+            "uid": user.uid,
+            "email": user.email,
+            "full_name": user.full_name,
+            "phone_number": user.phone_number,
+            "role": user.role,
+            "resume_url": user.resume_url,
+            "created_at": user.created_at,
+            "location": user.location,
+            "years_of_experience": user.years_of_experience,
+            "key_skills": user.key_skills,
+            "score": round(score, 4),
+            "similarity": round(similarity, 4),
+            "skill_overlap": round(overlap, 4),
+        }
+        for user, score, similarity, overlap in ranked
+    ]
@@ -0,0 +1,21 @@
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.firebase import get_current_user
+from db.database import get_db
+from db.task_queue import get_task
+from models.task import TaskStatusOut
+
+router = APIRouter(prefix="/tasks", tags=["Tasks"])
+
+@router.get("/{task_id}", response_model=TaskStatusOut)
+async def get_task_status(
+    task_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    task = await get_task(db, task_id)
+    # Report other users' tasks as missing rather than forbidden
+    if not task or task.owner_uid != current_user["uid"]:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
@@ -1,50 +1,97 @@
 # routers/upload_router.py
-from grpc import Status
 from sqlalchemy.future import select
-from fastapi import APIRouter, BackgroundTasks, UploadFile, File, Depends, HTTPException
-from requests import Session
-from config.s3_client import get_s3_client
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from config.s3_client import RESUME_BUCKET_NAME, get_s3_client
 from db.mongo import get_mongo_client
 from schemas.user import User
 from config.firebase import get_current_user  # <-- Important: use the same
-from firebase_admin import auth
-import boto3
+import asyncio
+import hashlib
+from boto3.s3.transfer import TransferConfig
+import time
 import uuid
-from datetime import datetime, timezone
+from fastapi import Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from db.database import get_db
-from services.resume_service import save_parsed_resume_to_mongo
-from utils.file_reader import extract_text
-from utils.dial_parser import parse_resume_with_dial
+from db.database import AsyncSessionLocal, get_db
+from db.resume_uploads import TERMINAL_STATUSES, create_resume_upload, get_resume_upload
+from db.task_queue import enqueue_task
+from config.settings import settings
+from models.resume import ResumeUploadStatusOut
+from services.resume_service import get_cached_parsed_resume, save_parsed_resume_to_mongo
+from services.tasks import TASK_PROCESS_RESUME
+from utils.executors import run_io
 
 router = APIRouter()
 
 # Setup S3
-BUCKET_NAME = "my-resume-bucket"
+BUCKET_NAME = RESUME_BUCKET_NAME
 s3 = get_s3_client()
 
-# Helper to create bucket if missing
-def create_bucket_if_not_exists(bucket_name):
+# Helper to build a content-addressed key: identical files map to the same S3 object
+def content_addressed_key(original_filename: str, content_hash: str) -> str:
+    ext = original_filename.split('.')[-1].lower()
+    return f"resumes/sha256/{content_hash}.{ext}"
+
+
+def hash_fileobj(fileobj, max_bytes: int, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file object read in chunks, enforcing `max_bytes`. Rewinds the file. Blocking."""
+    digest = hashlib.sha256()
+    reader = SizeLimitedReader(fileobj, max_bytes)
+    while chunk := reader.read(chunk_size):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def s3_object_exists(s3_key: str) -> bool:
     try:
-        s3.head_bucket(Bucket=bucket_name)
+        s3.head_object(Bucket=BUCKET_NAME, Key=s3_key)
+        return True
     except s3.exceptions.ClientError:
-        s3.create_bucket(Bucket=bucket_name)
+        return False
+
+
+class UploadTooLargeError(ValueError):
+    pass
 
-create_bucket_if_not_exists(BUCKET_NAME)
 
-# Helper to generate unique filename
-def generate_unique_filename(original_filename: str, user_uid: str) -> str:
-    ext = original_filename.split('.')[-1]
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
-    unique_id = uuid.uuid4().hex[:8]
-    return f"{user_uid}-resume-{timestamp}-{unique_id}.{ext}"
+class SizeLimitedReader:
+    """File-like wrapper that raises UploadTooLargeError once more than `max_bytes` have been read."""
 
+    def __init__(self, fileobj, max_bytes: int):
+        self._fileobj = fileobj
+        self._max_bytes = max_bytes
+        self.bytes_read = 0
 
-from fastapi import BackgroundTasks
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._fileobj.read(size)
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self._max_bytes:
+            raise UploadTooLargeError(f"File exceeds the {self._max_bytes} byte limit")
+        return chunk
+
+
+def stream_to_s3(fileobj, s3_key: str, content_type: str) -> int:
+    """
+    Stream a file object to S3 (multipart above the threshold) without loading it into memory.
+    Blocking: run it in a thread. Returns the number of bytes uploaded.
+    """
+    reader = SizeLimitedReader(fileobj, settings.resume_max_upload_bytes)
+    s3.upload_fileobj(
+        reader,
+        BUCKET_NAME,
+        s3_key,
+        ExtraArgs={"ContentType": content_type},
+        Config=TransferConfig(
+            multipart_threshold=settings.s3_multipart_threshold_bytes,
+            multipart_chunksize=settings.s3_multipart_chunksize_bytes,
+            use_threads=False,
+        ),
+    )
+    return reader.bytes_read
 
 @router.post("/resume")
 async def upload_resume(
-    background_tasks: BackgroundTasks,  # Remember : In python Non-default argument (& required) follows default argument
     file: UploadFile = File(...),        
     current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -66,17 +113,27 @@ async def upload_resume(
 
     uid = current_user.get("uid")
 
-    unique_filename = generate_unique_filename(file.filename, user_uid=uid)
-    file_content = await file.read()
+    # The multipart body is already spooled by now; this only saves hashing and uploading
+    # a file whose declared size is over the limit. SizeLimitedReader covers undeclared sizes.
+    if file.size is not None and file.size > settings.resume_max_upload_bytes:
+        raise HTTPException(status_code=413, detail="Resume file is too large.")
 
-    # Upload to S3
-    s3_key = f"resumes/{unique_filename}"
-    s3.put_object(
-        Bucket=BUCKET_NAME,
-        Key=s3_key,
-        Body=file_content,
-        ContentType=file.content_type
-    )
+    upload_started = time.perf_counter()
+    try:
+        # Hash the spooled file in chunks; re-uploads of the same bytes reuse the S3 object
+        content_hash = await run_io(hash_fileobj, file.file, settings.resume_max_upload_bytes)
+        s3_key = content_addressed_key(file.filename, content_hash)
+
+        # Stream the spooled upload to S3 in a thread; the background stage re-reads it from S3
+        if not await run_io(s3_object_exists, s3_key):
+            await run_io(stream_to_s3, file.file, s3_key, file.content_type)
+    except UploadTooLargeError:
+        raise HTTPException(status_code=413, detail="Resume file is too large.")
+
+    stage_timings = {"upload": round((time.perf_counter() - upload_started) * 1000, 1)}
+
+    # Same file parsed before: skip extraction and the LLM call entirely
+    cached_resume = await get_cached_parsed_resume(content_hash)
 
     file_url = f"http://localhost:4566/{BUCKET_NAME}/{s3_key}"
 
@@ -87,6 +144,31 @@ async def upload_resume(
     if user:
         user.resume_url = file_url
         try:
+            if cached_resume is not None:
+                upload = await create_resume_upload(
+                    db, uid, s3_key, file.content_type,
+                    {**stage_timings, "parse_cache_hit": 1}, content_hash=content_hash, status="saved",
+                )
+            else:
+                upload = await create_resume_upload(
+                    db, uid, s3_key, file.content_type, stage_timings, content_hash=content_hash
+                )
+                # The worker re-reads the file from S3, so only the key goes into the queue
+                upload.task_id = await enqueue_task(
+                    db,
+                    TASK_PROCESS_RESUME,
+                    {
+                        "upload_id": str(upload.id),
+                        "uid": uid,
+                        "s3_key": s3_key,
+                        "content_type": file.content_type,
+                        "content_hash": content_hash,
+                        "stage_timings": stage_timings,
+                        "enqueued_at": time.time(),
+                    },
+                    owner_uid=uid,
+                    commit=False,
+                )
             await db.commit()
             await db.refresh(user)
         except Exception:
@@ -95,27 +177,46 @@ async def upload_resume(
     else:
         raise HTTPException(status_code=404, detail="User not found.")
 
-    # Background task
-    background_tasks.add_task(
-        process_resume_background_task,
-        file_content,
-        file.content_type,
-        uid
-    )
-
-    return {"message": "Resume uploaded successfully!", "file_url": file_url}
+    if cached_resume is not None:
+        await save_parsed_resume_to_mongo(uid, cached_resume)
 
+    return {
+        "message": "Resume uploaded successfully!",
+        "file_url": file_url,
+        "upload_id": str(upload.id),
+        "status": upload.status,
+    }
 
-async def process_resume_background_task(file_content: bytes, content_type: str, user_id: str):
-    """Extract text, parse via LLM, and save parsed JSON into Mongo."""
-    # 1. Extract plain text
-    text = await extract_text(file_content, content_type)
 
-    # 2. Parse with DIAL LLM
-    parsed_resume = await parse_resume_with_dial(text)
-
-    # 3. Save parsed JSON into MongoDB
-    await save_parsed_resume_to_mongo(user_id, parsed_resume)
+@router.get("/resume/status/{upload_id}", response_model=ResumeUploadStatusOut)
+async def get_resume_upload_status(
+    upload_id: uuid.UUID,
+    wait: float = Query(0, ge=0, le=30, description="Long-poll: seconds to wait for the status to change"),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Processing status of an uploaded resume with per-stage durations (ms).
+    With `wait`, the request is held until the status changes, the upload finishes or `wait` elapses.
+    """
+    deadline = time.monotonic() + wait
+    initial_status = None
+
+    while True:
+        # A fresh short session per poll so a long-poll does not pin a pooled connection
+        async with AsyncSessionLocal() as db:
+            upload = await get_resume_upload(db, upload_id)
+
+        if not upload or upload.uid != current_user.get("uid"):
+            raise HTTPException(status_code=404, detail="Resume upload not found")
+
+        initial_status = initial_status or upload.status
+        if (
+            upload.status != initial_status
+            or upload.status in TERMINAL_STATUSES
+            or time.monotonic() >= deadline
+        ):
+            return upload
+        await asyncio.sleep(0.5)
 
 @router.get("/resume/{user_id}")
 async def get_parsed_resume(user_id: str):
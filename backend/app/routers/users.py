@@ -1,17 +1,16 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
-from sqlalchemy import update
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-import json
 from db.mongo import get_mongo_client
-from utils.dial_parser import get_text_embedding
 from db.database import get_db
+from db.task_queue import enqueue_task
 from models.user import UserUpdateSchema
 from schemas.user import User 
 from config.firebase import get_current_user
 from models.auth import UserInfo  
 from utils.logger import setup_logger
+from services.tasks import TASK_EMBED_USER
 
 router = APIRouter(prefix="/users", tags=["Users"])
 logger = setup_logger(__name__)  
@@ -28,37 +27,9 @@ async def read_users_me(current_user: dict = Depends(get_current_user)):
     )
 
 
-async def generate_and_store_summary(user: User, db: AsyncSession):
-    try:
-        logger.info(f"Starting summary generation for UID: {user.uid}")
-
-        summary_text = (
-            f"Location: {user.location or 'N/A'}\n"
-            f"Years of Experience: {user.years_of_experience or 'N/A'}\n"
-            f"Key Skills: {', '.join(user.key_skills or [])}"
-        )
-
-        logger.debug(f"Summary text for embedding:\n{summary_text}")
-
-        embedding_vector = get_text_embedding(summary_text)
-        logger.info(f"Embedding generated for UID: {user.uid}")
-
-        await db.execute(
-            update(User)
-            .where(User.uid == user.uid)
-            .values(embedding=embedding_vector)
-        )
-        await db.commit()
-        logger.info(f"Embedding stored successfully for UID: {user.uid}")
-    except Exception as e:
-        logger.error(f"Embedding save failed for UID {user.uid}: {e}")
-        raise
-
-
 @router.put("/me", response_model=UserUpdateSchema)
 async def update_my_profile(
     update_data: UserUpdateSchema,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -109,12 +80,12 @@ async def update_my_profile(
             user.profile_completed = False
             logger.info(f"Profile still incomplete for UID: {uid}")
 
+        # Enqueued in the same transaction: the embedding task exists iff the profile update commits
+        task_id = await enqueue_task(db, TASK_EMBED_USER, {"uid": uid}, owner_uid=uid, commit=False)
         await db.commit()
         await db.refresh(user)
         logger.info(f"Profile updated for UID: {user.uid}")
-
-        background_tasks.add_task(generate_and_store_summary, user, db)
-        logger.info(f"Background embedding task scheduled for UID: {user.uid}")
+        logger.info(f"Embedding task {task_id} queued for UID: {user.uid}")
         return update_data
 
     except Exception as e:
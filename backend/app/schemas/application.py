@@ -0,0 +1,19 @@
+from sqlalchemy import Column, ForeignKey, Index, String, TIMESTAMP, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+from db.database import Base
+
+class Application(Base):
+    __tablename__ = "applications"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_id = Column(UUID(as_uuid=True), ForeignKey("job_listings.id", ondelete="CASCADE"), nullable=False)
+    uid = Column(String(255), ForeignKey("users.uid", ondelete="CASCADE"), nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    __table_args__ = (
+        # Also serves job -> applicants lookups (leading column)
+        UniqueConstraint("job_id", "uid", name="uq_application_job_uid"),
+        Index("ix_applications_uid_created_at", "uid", "created_at"),
+    )
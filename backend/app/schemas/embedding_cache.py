@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, TIMESTAMP
+from sqlalchemy.sql import func
+from db.vector_type import Vector
+from db.database import Base
+
+class EmbeddingCacheEntry(Base):
+    __tablename__ = "embedding_cache"
+
+    # Keyed by embedding model + SHA-256 of the normalized input text
+    model = Column(String(255), primary_key=True)
+    text_hash = Column(String(64), primary_key=True)
+    embedding = Column(Vector(1536), nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now())
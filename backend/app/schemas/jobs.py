@@ -1,10 +1,13 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ARRAY
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ARRAY, TIMESTAMP
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import deferred, validates
 from sqlalchemy.sql import func
 import uuid
-from pgvector.sqlalchemy import Vector
+from db.vector_type import Vector
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.dialects.postgresql import UUID
 from db.database import Base
+from schemas.user import normalize_skill_tokens
     
 class JobListing(Base):
     __tablename__ = "job_listings"
@@ -13,13 +16,22 @@ class JobListing(Base):
     title = Column(String, nullable=False)
     description = Column(String, nullable=False)
     key_skills = Column(ARRAY(String), nullable=False)
+    skill_tokens = Column(postgresql.ARRAY(String), nullable=False, default=list, server_default="{}")  # normalized key_skills, GIN indexed
     experience_required = Column(Integer, nullable=False)
     location = Column(String, nullable=False)
     company_name = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
     recruiter_id = Column(String, nullable=False)
     job_summary = Column(String, nullable=True)
+    created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
 
     
-    embedding = Column(Vector(1536))  
-    applied_user_ids = Column(ARRAY(String), default=[])  
\ No newline at end of file
+    embedding = deferred(Column(Vector(1536)), raiseload=True)  # never loaded with the entity; select the column or score in SQL
+    embedding_version = Column(Integer, nullable=False, default=0, server_default="0")  # bumped when the embedded text changes
+    embedding_text_hash = Column(String(64))  # text_hash_of the embedded summary; an unchanged summary is not re-embedded
+    applied_user_ids = Column(ARRAY(String), default=[])  # legacy, superseded by the applications table (migration 0004)
+
+    @validates("key_skills")
+    def _sync_skill_tokens(self, key, value):
+        self.skill_tokens = normalize_skill_tokens(value)
+        return value
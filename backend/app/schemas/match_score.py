@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Float, ForeignKey, String, UniqueConstraint
+from sqlalchemy import Column, Float, ForeignKey, Integer, String, UniqueConstraint
 from db.database import Base
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -10,6 +10,10 @@ class MatchScore(Base):
     job_id = Column(UUID(as_uuid=True), ForeignKey("job_listings.id"), nullable=False)
     score = Column(Float, nullable=False)
 
+    # Embedding versions the score was computed from; a mismatch means the score is stale
+    user_embedding_version = Column(Integer, nullable=True)
+    job_embedding_version = Column(Integer, nullable=True)
+
     __table_args__ = (
         UniqueConstraint("uid", "job_id", name="uq_uid_job"),
     )
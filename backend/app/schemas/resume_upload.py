@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Index, String, Text, TIMESTAMP
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+import uuid
+from db.database import Base
+
+class ResumeUpload(Base):
+    __tablename__ = "resume_uploads"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    uid = Column(String(255), nullable=False)
+    s3_key = Column(Text, nullable=False)
+    content_type = Column(String(255), nullable=False)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the file, also its S3 key
+    task_id = Column(UUID(as_uuid=True), nullable=True)
+
+    # queued -> extracting -> parsing -> saved, or failed
+    status = Column(String(20), nullable=False, default="queued", server_default="queued")
+    stage_timings = Column(JSONB, nullable=False, default=dict)  # stage name -> milliseconds
+    error = Column(Text)
+
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_resume_uploads_uid_created_at", "uid", "created_at"),
+    )
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Index, Integer, String, Text, TIMESTAMP
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+import uuid
+from db.database import Base
+
+class Task(Base):
+    __tablename__ = "tasks"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(64), nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    owner_uid = Column(String(255), nullable=True)  # user allowed to query the status
+
+    # queued -> running -> succeeded | failed (running -> queued again on a retryable failure)
+    status = Column(String(20), nullable=False, default="queued", server_default="queued")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts = Column(Integer, nullable=False, default=3, server_default="3")
+    last_error = Column(Text)
+
+    run_after = Column(TIMESTAMP, nullable=False, server_default=func.now())
+    locked_at = Column(TIMESTAMP)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_tasks_status_run_after", "status", "run_after"),
+    )
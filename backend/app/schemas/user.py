@@ -1,9 +1,21 @@
 # models/user.py
 from sqlalchemy import ARRAY, Boolean, Column, Integer, String, Text, TIMESTAMP
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import deferred, validates
 from sqlalchemy.sql import func
-from pgvector.sqlalchemy import Vector
+from db.vector_type import Vector
 from db.database import Base
 
+
+def normalize_skill_tokens(skills) -> list[str]:
+    """Lowercase, trim and deduplicate skills (first occurrence wins) for indexed matching."""
+    tokens = []
+    for skill in skills or []:
+        token = skill.strip().lower() if isinstance(skill, str) else ""
+        if token and token not in tokens:
+            tokens.append(token)
+    return tokens
+
 class User(Base):
     __tablename__ = "users"
 
@@ -18,8 +30,16 @@ class User(Base):
 
     # pgvector
     key_skills = Column(ARRAY(String), default=[])
+    skill_tokens = Column(postgresql.ARRAY(String), nullable=False, default=list, server_default="{}")  # normalized key_skills, GIN indexed
     location = Column(String)
     years_of_experience = Column(Integer)
-    embedding = Column(Vector(1536))  #For semantic search
+    embedding = deferred(Column(Vector(1536)), raiseload=True)  # never loaded with the entity; select the column or score in SQL
+    embedding_version = Column(Integer, nullable=False, default=0, server_default="0")  # bumped when the embedded text changes
+    embedding_text_hash = Column(String(64))  # text_hash_of the embedded summary; an unchanged summary is not re-embedded
     profile_completed = Column(Boolean, default=False)
-    
\ No newline at end of file
+    
+
+    @validates("key_skills")
+    def _sync_skill_tokens(self, key, value):
+        self.skill_tokens = normalize_skill_tokens(value)
+        return value
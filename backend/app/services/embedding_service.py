@@ -0,0 +1,102 @@
+import hashlib
+import numpy as np
+from cachetools import LRUCache
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from config.settings import settings
+from db.database import task_session
+from schemas.embedding_cache import EmbeddingCacheEntry
+from utils.dial_parser import DIAL_DEPLOYMENT_NAME
+from utils.embedding_batcher import embedding_batcher
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "evictions": 0}
+
+
+class _CountingLRUCache(LRUCache):
+    """LRUCache that counts evictions."""
+
+    def popitem(self):
+        item = super().popitem()
+        _stats["evictions"] += 1
+        return item
+
+
+# Vectors are kept as float32 arrays: ~6 KB each instead of ~50 KB as a list of Python floats
+_memory_cache = _CountingLRUCache(maxsize=settings.embedding_cache_size)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so re-indented or re-saved text maps to the same key."""
+    return " ".join(text.split())
+
+
+def text_hash_of(text: str) -> str:
+    """SHA-256 of the normalized text. Entries are keyed by (model, text hash)."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+async def get_embedding(text: str, model: str = DIAL_DEPLOYMENT_NAME) -> list[float]:
+    """
+    Return the embedding for `text`, consulting the in-process LRU, then the
+    embedding_cache table, and only calling DIAL on a miss in both.
+    """
+    normalized = normalize_text(text)
+    text_hash = text_hash_of(normalized)
+    key = (model, text_hash)
+
+    cached = _memory_cache.get(key)
+    if cached is not None:
+        _stats["memory_hits"] += 1
+        return cached.tolist()
+
+    async with task_session() as db:
+        result = await db.execute(
+            select(EmbeddingCacheEntry.embedding).where(
+                EmbeddingCacheEntry.model == model,
+                EmbeddingCacheEntry.text_hash == text_hash,
+            )
+        )
+        stored = result.scalar_one_or_none()
+
+    if stored is not None:
+        _stats["db_hits"] += 1
+        vector = np.asarray(stored, dtype=np.float32)
+        _memory_cache[key] = vector
+        return vector.tolist()
+
+    _stats["misses"] += 1
+    embedding = await embedding_batcher.embed(normalized)
+
+    _memory_cache[key] = np.asarray(embedding, dtype=np.float32)
+    await _store(model, text_hash, embedding)
+    return embedding
+
+
+async def _store(model: str, text_hash: str, embedding: list[float]):
+    """Persist a fresh embedding; a failure here only costs a future cache miss."""
+    try:
+        async with task_session() as db:
+            await db.execute(
+                insert(EmbeddingCacheEntry)
+                .values(model=model, text_hash=text_hash, embedding=embedding)
+                .on_conflict_do_nothing()
+            )
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"Failed to persist embedding cache entry {text_hash}: {e}")
+
+
+def get_embedding_cache_stats() -> dict:
+    """Hit, miss and eviction counters of the embedding cache."""
+    hits = _stats["memory_hits"] + _stats["db_hits"]
+    lookups = hits + _stats["misses"]
+    return {
+        **_stats,
+        "hits": hits,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "memory_size": len(_memory_cache),
+        "memory_capacity": _memory_cache.maxsize,
+    }
@@ -9,6 +9,8 @@ from models.auth import SignUpSchema, UserSignupResponse, LoginSchema
 from dotenv import load_dotenv
 from sqlalchemy.ext.asyncio import AsyncSession
 import httpx
+from utils.executors import run_io
+from utils.metrics import timed_dependency, track_dependency
 
 
 
@@ -20,7 +22,8 @@ async def signup_candidate_service(
 ) -> UserSignupResponse:
     try:
         
-        new_user = auth.create_user(
+        new_user = await run_io(
+            timed_dependency("firebase", "create_user", auth.create_user),
             email=user_data.email,
             password=user_data.password,
             email_verified=False,
@@ -28,7 +31,10 @@ async def signup_candidate_service(
         )
 
         
-        auth.set_custom_user_claims(new_user.uid, {'role': 'candidate'})
+        await run_io(
+            timed_dependency("firebase", "set_custom_user_claims", auth.set_custom_user_claims),
+            new_user.uid, {'role': 'candidate'}
+        )
 
         
         user_record = User(
@@ -74,14 +80,14 @@ async def login_service(user_data: LoginSchema) -> dict:
 
     signin_url = f"https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword?key={FIREBASE_API_KEY}"
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(signin_url, json={
-            "email": user_data.email,
-            "password": user_data.password,
-            "returnSecureToken": True
-        })
+    with track_dependency("firebase", "sign_in_with_password"):
+        async with httpx.AsyncClient() as client:
+            response = await client.post(signin_url, json={
+                "email": user_data.email,
+                "password": user_data.password,
+                "returnSecureToken": True
+            })
 
-    print(response.json())
     if response.status_code != 200:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -89,7 +95,7 @@ async def login_service(user_data: LoginSchema) -> dict:
         )
 
     id_token = response.json()["idToken"]
-    decoded_token = auth.verify_id_token(id_token)
+    decoded_token = await run_io(timed_dependency("firebase", "verify_id_token", auth.verify_id_token), id_token)
 
     return {"token": id_token}
 
@@ -1,31 +1,65 @@
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
-
-from sqlalchemy import update
+import hashlib
+import json
+from datetime import datetime
+from cachetools import TTLCache
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, func, select, tuple_, update
+from config.settings import settings
+from db.database import task_session
 from schemas.jobs import JobListing
+from schemas.user import normalize_skill_tokens
 from db.mongo import get_mongo_client
-from utils.dial_parser import get_text_embedding
+from services.embedding_service import get_embedding, text_hash_of
+from services.match_score_service import precompute_scores_for_job
 from sqlalchemy.ext.asyncio import AsyncSession
 from utils.logger import setup_logger
 from uuid import UUID
 
 logger = setup_logger(__name__)
-executor = ThreadPoolExecutor(max_workers=3)
 
-async def store_job_summary_embedding(job_id: UUID, summary_text: str, db: AsyncSession):
+# Columns served by GET /jobs; the embedding is never loaded
+JOB_LIST_COLUMNS = (
+    JobListing.id,
+    JobListing.title,
+    JobListing.description,
+    JobListing.key_skills,
+    JobListing.experience_required,
+    JobListing.location,
+    JobListing.company_name,
+    JobListing.is_active,
+    JobListing.recruiter_id,
+    JobListing.job_summary,
+    JobListing.created_at,
+)
+
+# Rendered pages keyed by their normalized query; cleared whenever a job is written
+_job_list_cache = TTLCache(maxsize=settings.job_list_cache_size, ttl=settings.job_list_cache_ttl_seconds)
+_job_list_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+async def store_job_summary_embedding(job_id: UUID, summary_text: str):
     """
     Stores a job summary and its embedding into both MongoDB and PostgreSQL.
 
+    The PostgreSQL session is only opened for a short lookup and the final write, not
+    around the embedding and MongoDB calls, so no pooled connection waits on them.
+    An unchanged summary is skipped, keeping the embedding version and the stored scores.
+
     Args:
         job_id (UUID): Unique identifier of the job listing.
         summary_text (str): Job summary text.
-        db (AsyncSession): Async SQLAlchemy session for PostgreSQL.
     """
     try:
-        loop = asyncio.get_running_loop()
+        text_hash = text_hash_of(summary_text)
+        async with task_session() as db:
+            result = await db.execute(
+                select(JobListing.embedding_text_hash).where(JobListing.id == job_id)
+            )
+            if result.scalar_one_or_none() == text_hash:
+                logger.info(f"Summary unchanged for job_id: {job_id}, skipping re-embedding")
+                return
 
-        # Generate embedding in a non-blocking way
-        embedding = await loop.run_in_executor(executor, get_text_embedding, summary_text)
+        # Reposted jobs hit the embedding cache instead of DIAL
+        embedding = await get_embedding(summary_text)
 
         if not isinstance(embedding, list) or not all(isinstance(i, float) for i in embedding):
             raise ValueError(f"Invalid embedding output received: {embedding}")
@@ -34,19 +68,29 @@ async def store_job_summary_embedding(job_id: UUID, summary_text: str, db: Async
         await _update_mongo_summary(job_id, summary_text, embedding)
 
         # Store summary and embedding in PostgreSQL (PGVector)
-        await db.execute(
-            update(JobListing)
-            .where(JobListing.id == job_id)
-            .values(
-                job_summary=summary_text.strip(),
-                embedding=embedding
+        async with task_session() as db:
+            result = await db.execute(
+                update(JobListing)
+                .where(JobListing.id == job_id, JobListing.embedding_text_hash.is_distinct_from(text_hash))
+                .values(
+                    job_summary=summary_text.strip(),
+                    embedding=embedding,
+                    embedding_text_hash=text_hash,
+                    embedding_version=JobListing.embedding_version + 1
+                )
             )
-        )
-        await db.commit()
-        logger.info(f"Job embedding successfully stored in PostgreSQL for job_id: {job_id}")
+            await db.commit()
+            if not result.rowcount:
+                # A concurrent run stored the same summary first
+                return
+            logger.info(f"Job embedding successfully stored in PostgreSQL for job_id: {job_id}")
+
+            # Score against every embedded candidate now so reads are pure lookups
+            await precompute_scores_for_job(job_id, db)
 
     except Exception as e:
         logger.error(f"Failed to store embedding for job_id {job_id}: {e}", exc_info=True)
+        raise
 
 
 async def _update_mongo_summary(job_id: UUID, summary_text: str, embedding: list[float]):
@@ -77,3 +121,98 @@ async def _update_mongo_summary(job_id: UUID, summary_text: str, embedding: list
         logger.info(f"Inserted new summary into MongoDB for job_id: {job_id}")
     else:
         logger.info(f"Updated existing summary in MongoDB for job_id: {job_id}")
+
+
+async def list_active_jobs(
+    db: AsyncSession,
+    limit: int,
+    after: tuple[datetime, UUID] | None = None,
+    location: str | None = None,
+    skills: list[str] | None = None,
+    max_experience: int | None = None,
+    company: str | None = None,
+):
+    """
+    Fetch one page of active jobs, newest first, keyed on (created_at, id).
+
+    Args:
+        db (AsyncSession): Async SQLAlchemy session for PostgreSQL.
+        limit (int): Page size.
+        after (tuple[datetime, UUID] | None): (created_at, id) of the last job of the previous page.
+        location (str | None): Case-insensitive substring of the location.
+        skills (list[str] | None): Skills the job must all list (case-insensitive).
+        max_experience (int | None): Only jobs requiring at most this many years.
+        company (str | None): Case-insensitive substring of the company name.
+
+    Returns:
+        list[Row]: Rows of JOB_LIST_COLUMNS.
+    """
+    filters = [JobListing.is_active == True]
+    if after is not None:
+        filters.append(tuple_(JobListing.created_at, JobListing.id) < tuple_(after[0], after[1]))
+    if location:
+        filters.append(func.lower(JobListing.location).ilike(f"%{location.lower()}%"))
+    tokens = normalize_skill_tokens(skills)
+    if tokens:
+        filters.append(JobListing.skill_tokens.contains(tokens))
+    if max_experience is not None:
+        filters.append(JobListing.experience_required <= max_experience)
+    if company:
+        filters.append(func.lower(JobListing.company_name).ilike(f"%{company.lower()}%"))
+
+    stmt = (
+        select(*JOB_LIST_COLUMNS)
+        .where(and_(*filters))
+        .order_by(JobListing.created_at.desc(), JobListing.id.desc())
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return result.fetchall()
+
+
+async def get_job_list_page(db: AsyncSession, cache_key: tuple | None, **query) -> dict:
+    """
+    Return a rendered GET /jobs page, from the TTL cache when possible (never when `cache_key` is None).
+
+    The page is a dict with `body` (JSON bytes), `etag` and `next_cursor`; `query` is passed
+    to `list_active_jobs`, whose `limit` is fetched one row larger to detect a next page.
+    """
+    if cache_key is not None:
+        cached = _job_list_cache.get(cache_key)
+        if cached is not None:
+            _job_list_stats["hits"] += 1
+            return cached
+        _job_list_stats["misses"] += 1
+
+    limit = query.pop("limit")
+    rows = await list_active_jobs(db, limit + 1, **query)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    jobs = [dict(row._mapping) for row in rows]
+    body = json.dumps(jsonable_encoder(jobs), separators=(",", ":")).encode("utf-8")
+    page = {
+        "body": body,
+        "etag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        "next_cursor": [rows[-1].created_at.isoformat(), str(rows[-1].id)] if has_more else None,
+    }
+    if cache_key is not None:
+        _job_list_cache[cache_key] = page
+    return page
+
+
+def invalidate_job_list_cache():
+    """Drop every cached GET /jobs page. Other processes expire theirs within the TTL."""
+    _job_list_cache.clear()
+    _job_list_stats["invalidations"] += 1
+
+
+def get_job_list_cache_stats() -> dict:
+    lookups = _job_list_stats["hits"] + _job_list_stats["misses"]
+    return {
+        **_job_list_stats,
+        "hit_rate": round(_job_list_stats["hits"] / lookups, 4) if lookups else 0.0,
+        "size": len(_job_list_cache),
+        "capacity": _job_list_cache.maxsize,
+        "ttl_seconds": _job_list_cache.ttl,
+    }
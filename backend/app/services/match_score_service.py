@@ -1,51 +1,101 @@
-import numpy as np
-from numpy.linalg import norm
 from sqlalchemy import select
-from schemas.jobs import JobListing
+from config.settings import settings
 from schemas.user import User
-from db.match_score import get_existing_scores, upsert_score
+from db.match_score import (
+    bulk_upsert_scores, get_jobs_needing_scores, get_nearest_jobs, get_top_jobs,
+    upsert_scores_for_job, upsert_scores_for_user,
+)
+from services.scoring_engine import EmbeddingMatrix, rank
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
-async def cosine_sim(a, b):
-    return float(np.dot(a, b) / (norm(a) * norm(b)))
-
-async def recommend_jobs(uid: str, db):
+async def recommend_jobs(uid: str, db, mode: str | None = None):
     logger.info(f"Starting job recommendation for user UID: {uid}")
 
-    result = await db.execute(select(User.embedding).where(User.uid == uid))
-    user_emb = result.scalar_one_or_none()
+    result = await db.execute(select(User.embedding, User.embedding_version).where(User.uid == uid))
+    row = result.one_or_none()
 
-    if user_emb is None:
+    if row is None or row.embedding is None:
         logger.warning("No embedding found for user.")
         return []
 
+    user_emb, user_version = row.embedding, row.embedding_version
     logger.info("User embedding fetched successfully.")
 
-    jobs_result = await db.execute(
-        select(JobListing.id, JobListing.embedding).where(JobListing.embedding != None)
-    )
-    jobs = jobs_result.fetchall()
+    mode = mode or settings.recommendation_mode
+    if mode == "ann":
+        try:
+            return await _recommend_jobs_ann(uid, user_emb, user_version, db)
+        except Exception as e:
+            logger.warning(f"ANN recommendation failed, falling back to exact scan: {e}")
+            await db.rollback()
+
+    return await _recommend_jobs_exact(uid, user_emb, user_version, db)
+
 
-    logger.info(f"Total jobs fetched from database: {len(jobs)}")
+async def _recommend_jobs_ann(uid: str, user_emb, user_version: int, db):
+    """Let pgvector rank jobs through the ANN index; only the top hits leave the database."""
+    results = await get_nearest_jobs(user_emb, db, limit=settings.recommendation_limit)
+    logger.info(f"ANN search returned {len(results)} jobs")
 
-    existing_scores = await get_existing_scores(uid, db)
-    logger.info(f"Existing match scores retrieved: {len(existing_scores)}")
+    # Persist the freshly computed hits so recruiters see them in rank_candidates
+    await bulk_upsert_scores(
+        db, [(uid, job_id, score, user_version, job_version) for job_id, score, job_version in results]
+    )
+
+    logger.info("Job recommendation process completed.")
+    return [(job_id, score) for job_id, score, _ in results]
 
-    results = []
 
-    for job_id, job_emb in jobs:
-        if str(job_id) in existing_scores:
-            logger.info(f"Reusing existing score for job ID: {job_id}")
-            results.append((job_id, existing_scores[str(job_id)]))
-        else:
-            logger.info(f"Computing new score for job ID: {job_id}")
-            score = await cosine_sim(user_emb, job_emb)
-            await upsert_score(db, uid, job_id, score)
-            logger.info(f"New score computed and stored: {score:.4f}")
-            results.append((job_id, score))
+async def _recommend_jobs_exact(uid: str, user_emb, user_version: int, db):
+    """
+    Exact scan over stored scores. Scores are normally precomputed when embeddings are
+    written, so this only rescores jobs whose score is missing or stale and then reads the top rows.
+    """
+    rows = await get_jobs_needing_scores(uid, user_version, db)
+    if rows:
+        logger.info(f"Computing {len(rows)} missing or stale scores")
+        job_versions = {job_id: job_version for job_id, _, job_version in rows}
+        new_scores = rank(user_emb, EmbeddingMatrix.from_rows((job_id, job_emb) for job_id, job_emb, _ in rows))
+        await bulk_upsert_scores(
+            db, [(uid, job_id, score, user_version, job_versions[job_id]) for job_id, score in new_scores]
+        )
 
-    results.sort(key=lambda x: x[1], reverse=True)
+    results = await get_top_jobs(uid, db, limit=settings.recommendation_limit)
     logger.info("Job recommendation process completed.")
-    return results[:10]
+    return [(job_id, score) for job_id, score in results]
+
+
+async def precompute_scores_for_job(job_id, db) -> int:
+    """
+    Score a newly embedded job against every embedded candidate, inside PostgreSQL.
+
+    Failures are logged and swallowed: applicants' missing scores are computed in place
+    when the ranking is read, then stored by the score_applicants task.
+    """
+    try:
+        written = await upsert_scores_for_job(db, job_id)
+        logger.info(f"Precomputed {written} match scores for job {job_id}")
+        return written
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Score precompute failed for job {job_id}: {e}", exc_info=True)
+        return 0
+
+
+async def precompute_scores_for_user(uid: str, db) -> int:
+    """
+    Score a newly embedded candidate against every active job, inside PostgreSQL.
+    Non-candidates match no rows.
+
+    Failures are logged and swallowed: missing scores are still computed lazily on read.
+    """
+    try:
+        written = await upsert_scores_for_user(db, uid)
+        logger.info(f"Precomputed {written} match scores for UID {uid}")
+        return written
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Score precompute failed for UID {uid}: {e}", exc_info=True)
+        return 0
@@ -1,5 +1,10 @@
 import logging
+import time
+from uuid import UUID
+from config.s3_client import RESUME_BUCKET_NAME, get_s3_client
+from db.resume_uploads import set_resume_upload_status
 from utils.file_reader import extract_text
+from utils.executors import run_io
 from utils.dial_parser import parse_resume_with_dial
 from db.mongo import get_mongo_client
 
@@ -26,6 +31,106 @@ async def process_resume_upload(file_content: bytes, content_type: str, candidat
     )
 
 
+def _parse_cache():
+    return get_mongo_client()["mydb"]["resume_parse_cache"]
+
+
+async def ensure_parse_cache_index():
+    """Unique index so parsed resumes are looked up by content hash."""
+    await _parse_cache().create_index("content_hash", unique=True)
+
+
+async def get_cached_parsed_resume(content_hash: str) -> dict | None:
+    """Parsed resume JSON previously produced for a file with this SHA-256, if any."""
+    document = await _parse_cache().find_one({"content_hash": content_hash})
+    return document["parsed_resume"] if document else None
+
+
+async def cache_parsed_resume(content_hash: str, parsed_resume: dict):
+    await _parse_cache().update_one(
+        {"content_hash": content_hash},
+        {"$set": {"parsed_resume": parsed_resume}},
+        upsert=True,
+    )
+
+
+async def process_stored_resume(
+    upload_id: UUID,
+    s3_key: str,
+    content_type: str,
+    user_id: str,
+    stage_timings: dict,
+    content_hash: str | None = None,
+    final_attempt: bool = True,
+):
+    """
+    Read an uploaded resume back from S3, extract text, parse via LLM and save the JSON into Mongo.
+
+    Each stage is recorded on the resume_uploads row (extracting -> parsing -> saved / failed)
+    together with its duration in milliseconds, so clients can poll the status and we can see
+    where ingestion time goes.
+    """
+    timings = dict(stage_timings)
+    started = time.perf_counter()
+
+    def _mark(stage: str, stage_started: float):
+        timings[stage] = round((time.perf_counter() - stage_started) * 1000, 1)
+
+    try:
+        # An identical file may have been parsed while this task was queued
+        cached = await get_cached_parsed_resume(content_hash) if content_hash else None
+        if cached is not None:
+            stage_started = time.perf_counter()
+            await save_parsed_resume_to_mongo(user_id, cached)
+            _mark("save", stage_started)
+            _mark("total", started)
+            timings["parse_cache_hit"] = 1
+            await set_resume_upload_status(upload_id, "saved", timings)
+            logger.info(f"Resume upload {upload_id} reused cached parse for {content_hash}")
+            return
+
+        await set_resume_upload_status(upload_id, "extracting", timings)
+
+        # 1. Fetch the stored object (boto3 is blocking, keep it off the event loop)
+        stage_started = time.perf_counter()
+        file_content = await run_io(_read_s3_object, s3_key)
+        _mark("fetch", stage_started)
+
+        # 2. Extract plain text
+        stage_started = time.perf_counter()
+        text = await extract_text(file_content, content_type)
+        _mark("extract", stage_started)
+        await set_resume_upload_status(upload_id, "parsing", timings)
+
+        # 3. Parse with DIAL LLM
+        stage_started = time.perf_counter()
+        parsed_resume = await parse_resume_with_dial(text)
+        _mark("parse", stage_started)
+        if content_hash:
+            await cache_parsed_resume(content_hash, parsed_resume)
+
+        # 4. Save parsed JSON into MongoDB
+        stage_started = time.perf_counter()
+        await save_parsed_resume_to_mongo(user_id, parsed_resume)
+        _mark("save", stage_started)
+    except Exception as e:
+        _mark("total", started)
+        # A retry will run the pipeline again, so only the last attempt is reported as failed
+        await set_resume_upload_status(
+            upload_id, "failed" if final_attempt else "queued", timings, error=f"{type(e).__name__}: {e}"
+        )
+        raise
+
+    _mark("total", started)
+    await set_resume_upload_status(upload_id, "saved", timings)
+    logger.info(f"Resume upload {upload_id} processed, stage timings (ms): {timings}")
+
+
+def _read_s3_object(s3_key: str) -> bytes:
+    s3 = get_s3_client()
+    return s3.get_object(Bucket=RESUME_BUCKET_NAME, Key=s3_key)["Body"].read()
+
+
 async def save_parsed_resume_to_mongo(user_id: str, parsed_resume: dict):
     """Save parsed resume JSON under user ID."""
     mongo_client = get_mongo_client()
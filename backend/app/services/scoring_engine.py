@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from typing import Any, Iterable
+import numpy as np
+
+
+@dataclass
+class EmbeddingMatrix:
+    """
+    Embeddings stacked into one contiguous float32 matrix with precomputed L2 norms.
+
+    Attributes:
+        ids (list): Identifier of each row (job id or user uid).
+        vectors (np.ndarray): (n, dim) float32 matrix.
+        norms (np.ndarray): (n,) L2 norm of each row.
+    """
+    ids: list
+    vectors: np.ndarray
+    norms: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[Any, Any]]) -> "EmbeddingMatrix":
+        """Build a matrix from (id, embedding) pairs, skipping rows without an embedding."""
+        ids, vectors = [], []
+        for row_id, embedding in rows:
+            if embedding is None:
+                continue
+            ids.append(row_id)
+            vectors.append(np.asarray(embedding, dtype=np.float32))
+
+        if not vectors:
+            return cls(ids=[], vectors=np.empty((0, 0), dtype=np.float32), norms=np.empty(0, dtype=np.float32))
+
+        matrix = np.ascontiguousarray(np.vstack(vectors), dtype=np.float32)
+        return cls(ids=ids, vectors=matrix, norms=np.linalg.norm(matrix, axis=1))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _safe(norms: np.ndarray) -> np.ndarray:
+    # Zero vectors score 0 instead of producing NaN
+    return np.where(norms == 0, 1.0, norms)
+
+
+def score_against(vector, targets: EmbeddingMatrix) -> np.ndarray:
+    """Score a single embedding against every row of `targets`. Returns an (M,) array."""
+    if not len(targets):
+        return np.empty(0, dtype=np.float32)
+    query = np.asarray(vector, dtype=np.float32)
+    query_norm = float(np.linalg.norm(query)) or 1.0
+    return (targets.vectors @ query) / (_safe(targets.norms) * query_norm)
+
+
+def rank(vector, targets: EmbeddingMatrix) -> list[tuple[Any, float]]:
+    """Return every (id, score) pair of `targets` for one embedding, best first."""
+    scores = score_against(vector, targets)
+    return [(targets.ids[i], float(scores[i])) for i in np.argsort(-scores)]
+
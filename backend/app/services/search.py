@@ -1,36 +1,49 @@
-from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from sqlalchemy import select, and_
-from sqlalchemy.dialects.postgresql import array
+from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from schemas.user import User
-from typing import List, Optional
-from sqlalchemy import or_, func
+from config.settings import settings
+from db.vector_search import HNSW_MAX_EF_SEARCH, set_ann_search_params
+from schemas.user import User, normalize_skill_tokens
 
 
 async def filter_candidates(
     skills: Optional[List[str]],
     location: Optional[str],
     min_experience: Optional[int],
-    db: AsyncSession
+    db: AsyncSession,
+    match_mode: str = "all",
 ):
-    return await search_candidates(skills, location, min_experience, db)
+    return await search_candidates(skills, location, min_experience, db, match_mode)
 
 async def search_candidates(
     skills: Optional[List[str]],
     location: Optional[str],
     min_experience: Optional[int],
-    db: AsyncSession
+    db: AsyncSession,
+    match_mode: str = "all",
 ):
+    """
+    Filter candidates through the indexes created by migration 0005.
+
+    Args:
+        skills (list[str] | None): Skills to match against the normalized `skill_tokens`
+            (GIN index); compared case-insensitively as whole skills.
+        location (str | None): Case-insensitive substring of the location (trigram index).
+        min_experience (int | None): Minimum years of experience.
+        db (AsyncSession): Async SQLAlchemy session for PostgreSQL.
+        match_mode (str): "all" requires every skill (`@>`), "any" at least one (`&&`).
+    """
     filters = []
 
-    if skills:
-        for skill in skills:
-            filters.append(
-                func.array_to_string(User.key_skills, ',').ilike(f"%{skill.lower()}%")
-            )
+    tokens = normalize_skill_tokens(skills)
+    if tokens:
+        if match_mode == "any":
+            filters.append(User.skill_tokens.overlap(tokens))
+        else:
+            filters.append(User.skill_tokens.contains(tokens))
 
     if location:
+        # Must stay lower(location) to match ix_users_location_trgm
         filters.append(func.lower(User.location).ilike(f"%{location.lower()}%"))
             
     if min_experience is not None:
@@ -40,3 +53,78 @@ async def search_candidates(
 
     result = await db.execute(stmt)
     return result.scalars().all()
+
+
+def _skill_overlap(query_tokens: list[str], candidate_tokens: list[str] | None) -> float:
+    """Share of the query skills the candidate has."""
+    if not query_tokens:
+        return 0.0
+    return len(set(query_tokens) & set(candidate_tokens or [])) / len(query_tokens)
+
+
+async def semantic_search_candidates(
+    query_embedding,
+    skills: Optional[List[str]],
+    location: Optional[str],
+    min_experience: Optional[int],
+    db: AsyncSession,
+    limit: int = 20,
+    offset: int = 0,
+):
+    """
+    Rank candidates by embedding similarity blended with skill overlap.
+
+    Location and experience are applied as filters of the ANN query on users.embedding.
+    Every page re-ranks the same pool of `semantic_search_oversample` times
+    `semantic_search_max_results` nearest candidates by the blended score (ties broken on uid)
+    and slices the requested page from it, so pages neither overlap nor skip results.
+
+    Args:
+        query_embedding (list[float]): Embedding of the free-text query or the job.
+        skills (list[str] | None): Skills for the overlap score. Without skills the score is the similarity.
+        location (str | None): Case-insensitive substring of the location.
+        min_experience (int | None): Minimum years of experience.
+        db (AsyncSession): Async SQLAlchemy session for PostgreSQL.
+        limit (int): Page size.
+        offset (int): Results to skip.
+
+    Returns:
+        list[tuple[User, float, float, float]]: (user, score, similarity, skill_overlap), best first.
+    """
+    window = min(offset + limit, settings.semantic_search_max_results)
+    if window <= offset:
+        return []
+    pool_size = min(
+        settings.semantic_search_max_results * max(1, settings.semantic_search_oversample),
+        HNSW_MAX_EF_SEARCH,
+    )
+
+    filters = [User.role == "candidate", User.embedding != None]
+    if location:
+        filters.append(func.lower(User.location).ilike(f"%{location.lower()}%"))
+    if min_experience is not None:
+        filters.append(User.years_of_experience >= min_experience)
+
+    await set_ann_search_params(db, pool_size)
+    distance = User.embedding.cosine_distance(query_embedding)
+    stmt = (
+        select(User, (1 - distance).label("similarity"))
+        .where(and_(*filters))
+        .order_by(distance)
+        .limit(pool_size)
+    )
+    result = await db.execute(stmt)
+
+    tokens = normalize_skill_tokens(skills)
+    vector_weight = settings.semantic_search_vector_weight
+    skill_weight = settings.semantic_search_skill_weight if tokens else 0.0
+    total_weight = (vector_weight + skill_weight) or 1.0
+
+    ranked = []
+    for user, similarity in result.all():
+        overlap = _skill_overlap(tokens, user.skill_tokens)
+        score = (vector_weight * similarity + skill_weight * overlap) / total_weight
+        ranked.append((user, score, float(similarity), overlap))
+
+    ranked.sort(key=lambda item: (-item[1], item[0].uid))
+    return ranked[offset:window]
@@ -0,0 +1,55 @@
+from prometheus_client import REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+from config.firebase import get_token_cache_stats
+from db.database import get_db_pool_stats
+from services.embedding_service import get_embedding_cache_stats
+from services.jobs_service import get_job_list_cache_stats
+from utils.executors import get_executor_stats
+
+def collect_stats() -> dict:
+    """Internal cache, pool and executor counters, exported as Prometheus gauges."""
+    return {
+        "embedding_cache": get_embedding_cache_stats(),
+        "auth_token_cache": get_token_cache_stats(),
+        "job_list_cache": get_job_list_cache_stats(),
+        "db_pool": get_db_pool_stats(),
+        "executors": get_executor_stats(),
+    }
+
+
+class StatsCollector:
+    """
+    Exports the numeric collect_stats() counters as gauges on the metrics port at scrape time.
+
+    `{"db_pool": {"primary": {"checked_out": 3}}}` becomes
+    `hirearchy_db_pool_checked_out{name="primary"} 3`; nested histograms are left to
+    the native Prometheus histograms.
+    """
+
+    def collect(self):
+        families = {}
+
+        def add(section: str, key: str, value, name: str | None = None):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return
+            metric = f"hirearchy_{section}_{key}"
+            if metric not in families:
+                labels = ["name"] if name is not None else []
+                families[metric] = GaugeMetricFamily(metric, f"{section} {key}", labels=labels)
+            families[metric].add_metric([name] if name is not None else [], value)
+
+        for section, values in collect_stats().items():
+            for key, value in values.items():
+                if isinstance(value, dict):
+                    # One level of named sub-sections (pools, executors)
+                    for sub_key, sub_value in value.items():
+                        add(section, sub_key, sub_value, name=key)
+                else:
+                    add(section, key, value)
+        yield from families.values()
+
+
+def register_stats_collector():
+    """Export collect_stats() on the process's Prometheus registry."""
+    REGISTRY.register(StatsCollector())
+
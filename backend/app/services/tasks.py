@@ -0,0 +1,71 @@
+import time
+from uuid import UUID
+from services.jobs_service import store_job_summary_embedding
+from services.resume_service import process_stored_resume
+from services.users_service import generate_and_store_summary
+from config.settings import settings
+from db.database import task_session
+from db.match_score import upsert_missing_applicant_scores
+from db.resume_uploads import set_resume_upload_status
+
+# Task kinds
+TASK_PROCESS_RESUME = "process_resume"
+TASK_EMBED_JOB = "embed_job"
+TASK_EMBED_USER = "embed_user"
+TASK_SCORE_APPLICANTS = "score_applicants"
+
+
+async def _process_resume(payload: dict, final_attempt: bool):
+    # Time spent waiting in the queue, measured from the enqueue timestamp
+    timings = dict(payload.get("stage_timings", {}))
+    timings["queue_wait"] = round((time.time() - payload["enqueued_at"]) * 1000, 1)
+    await process_stored_resume(
+        UUID(payload["upload_id"]),
+        payload["s3_key"],
+        payload["content_type"],
+        payload["uid"],
+        timings,
+        content_hash=payload.get("content_hash"),
+        final_attempt=final_attempt,
+    )
+
+
+# Embedding handlers open their own sessions, only around the database writes
+async def _embed_job(payload: dict, final_attempt: bool):
+    await store_job_summary_embedding(UUID(payload["job_id"]), payload["summary_text"])
+
+
+async def _embed_user(payload: dict, final_attempt: bool):
+    await generate_and_store_summary(payload["uid"])
+
+
+async def _score_applicants(payload: dict, final_attempt: bool):
+    # Stores scores the embedding precompute did not write, e.g. for applications that predate it,
+    # one bounded, committed chunk at a time
+    job_id = UUID(payload["job_id"])
+    chunk_size = settings.match_score_upsert_chunk_size
+    async with task_session() as db:
+        while await upsert_missing_applicant_scores(db, job_id, chunk_size) == chunk_size:
+            pass
+
+
+# Handlers run by worker.py, keyed by task kind, called as handler(payload, final_attempt).
+# A handler raising marks the attempt failed.
+TASK_HANDLERS = {
+    TASK_PROCESS_RESUME: _process_resume,
+    TASK_EMBED_JOB: _embed_job,
+    TASK_EMBED_USER: _embed_user,
+    TASK_SCORE_APPLICANTS: _score_applicants,
+}
+
+
+async def _process_resume_expired(payload: dict):
+    await set_resume_upload_status(
+        UUID(payload["upload_id"]), "failed", error="Processing was interrupted on the final attempt"
+    )
+
+
+# Called as handler(payload) when a task is failed because its worker died on the last attempt
+TASK_EXPIRED_HANDLERS = {
+    TASK_PROCESS_RESUME: _process_resume_expired,
+}
@@ -0,0 +1,72 @@
+from sqlalchemy import select, update
+from db.database import task_session
+from schemas.user import User
+from services.embedding_service import get_embedding, text_hash_of
+from services.match_score_service import precompute_scores_for_user
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+async def generate_and_store_summary(uid: str):
+    """
+    Build the profile summary for `uid`, embed it and store the vector in PostgreSQL.
+
+    Opens its own short sessions: one to read the profile, one for the final write.
+    No connection is held while the embedding is requested.
+
+    Args:
+        uid (str): Firebase UID of the candidate.
+    """
+    try:
+        logger.info(f"Starting summary generation for UID: {uid}")
+
+        async with task_session() as db:
+            result = await db.execute(
+                select(
+                    User.location, User.years_of_experience, User.key_skills, User.embedding_text_hash
+                ).where(User.uid == uid)
+            )
+            user = result.one_or_none()
+        if user is None:
+            logger.warning(f"User not found for summary generation: {uid}")
+            return
+
+        summary_text = (
+            f"Location: {user.location or 'N/A'}\n"
+            f"Years of Experience: {user.years_of_experience or 'N/A'}\n"
+            f"Key Skills: {', '.join(user.key_skills or [])}"
+        )
+
+        logger.debug(f"Summary text for embedding:\n{summary_text}")
+
+        # An unchanged summary keeps its embedding, version and scores
+        text_hash = text_hash_of(summary_text)
+        if text_hash == user.embedding_text_hash:
+            logger.info(f"Summary unchanged for UID: {uid}, skipping re-embedding")
+            return
+
+        embedding_vector = await get_embedding(summary_text)
+        logger.info(f"Embedding generated for UID: {uid}")
+
+        async with task_session() as db:
+            result = await db.execute(
+                update(User)
+                .where(User.uid == uid, User.embedding_text_hash.is_distinct_from(text_hash))
+                .values(
+                    embedding=embedding_vector,
+                    embedding_text_hash=text_hash,
+                    embedding_version=User.embedding_version + 1,
+                )
+            )
+            await db.commit()
+            if not result.rowcount:
+                # A concurrent save stored the same summary first
+                return
+            logger.info(f"Embedding stored successfully for UID: {uid}")
+
+            # Score against every active job now so recommendations are pure lookups
+            await precompute_scores_for_user(uid, db)
+    except Exception as e:
+        logger.error(f"Embedding save failed for UID {uid}: {e}")
+        raise
@@ -0,0 +1,109 @@
+import asyncio
+import random
+import time
+import httpx
+from config.settings import settings
+from utils.logger import setup_logger
+from utils.metrics import observe_dependency
+
+logger = setup_logger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class DialClient:
+    """
+    Shared async HTTP client for the DIAL API.
+
+    Keeps a keep-alive connection pool, caps in-flight requests with a semaphore and
+    retries transient failures (timeouts, 429, 5xx) with full-jitter exponential backoff.
+    """
+
+    def __init__(self):
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def start(self):
+        """Create the pooled client. Called from the app lifespan; also done lazily on first use."""
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            base_url=settings.dial_base_url,
+            headers={"Content-Type": "application/json", "Api-Key": settings.dialapi},
+            timeout=httpx.Timeout(settings.dial_timeout, connect=settings.dial_connect_timeout),
+            limits=httpx.Limits(
+                max_connections=settings.dial_max_connections,
+                max_keepalive_connections=settings.dial_max_connections,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(settings.dial_max_concurrency)
+        logger.info("DIAL HTTP client started.")
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("DIAL HTTP client closed.")
+
+    async def post(self, path: str, payload: dict) -> httpx.Response:
+        """
+        POST `payload` to `path` (api-version is appended).
+
+        Returns the last response once it succeeds or is not retryable / retries are exhausted;
+        transport errors are re-raised after the last attempt.
+        """
+        await self.start()
+        params = {"api-version": settings.dial_api_version}
+        operation = self._operation(path)
+
+        for attempt in range(settings.dial_max_retries + 1):
+            try:
+                async with self._semaphore:
+                    started = time.perf_counter()
+                    try:
+                        response = await self._client.post(path, json=payload, params=params)
+                    except httpx.TransportError:
+                        observe_dependency("dial", operation, time.perf_counter() - started, "error")
+                        raise
+                    observe_dependency(
+                        "dial", operation, time.perf_counter() - started,
+                        "success" if response.is_success else "error",
+                    )
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt == settings.dial_max_retries:
+                    return response
+                delay = self._retry_after(response) or self._backoff(attempt)
+                logger.warning(f"DIAL {path} returned {response.status_code}, retrying in {delay:.2f}s")
+            except httpx.TransportError as e:
+                if attempt == settings.dial_max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"DIAL {path} failed ({e!r}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _operation(path: str) -> str:
+        """Metrics label: embedding vs chat deployments."""
+        if path.endswith("/embeddings"):
+            return "embedding"
+        if path.endswith("/chat/completions"):
+            return "chat"
+        return "other"
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        return random.uniform(0, min(settings.dial_backoff_max, settings.dial_backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> float | None:
+        try:
+            return min(float(response.headers["Retry-After"]), settings.dial_backoff_max)
+        except (KeyError, ValueError):
+            return None
+
+
+dial_client = DialClient()
+
+
+def get_dial_client() -> DialClient:
+    """Returns the shared DIAL client instance."""
+    return dial_client
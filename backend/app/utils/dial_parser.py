@@ -1,43 +1,40 @@
 import json
-import os
-import requests
-from dotenv import load_dotenv
+from utils.dial_client import dial_client
+from utils.logger import setup_logger
 
+logger = setup_logger(__name__)
 
-load_dotenv()
-
-DIAL_API_KEY = os.getenv("DIALAPI")
+# API key, base URL and api-version come from settings via the shared DIAL client
 DIAL_DEPLOYMENT_NAME = "text-embedding-ada-002"
-DIAL_API_VERSION = os.getenv("DIAL_API_VERSION", "2023-12-01-preview")
 
 
-def get_text_embedding(text: str) -> list[float]:
+async def get_text_embedding(text: str) -> list[float]:
     """
     Send text to DIAL embedding endpoint and return the embedding vector.
     """
-    url = f"https://ai-proxy.lab.epam.com/openai/deployments/{DIAL_DEPLOYMENT_NAME}/embeddings?api-version={DIAL_API_VERSION}"
-    headers = {
-        "Content-Type": "application/json",
-        "Api-Key": DIAL_API_KEY
-    }
-    payload = {"input": text}
+    return (await get_text_embeddings([text]))[0]
 
-    print(f"🔍 Sending request to: {url}")
-    print(f"📦 Payload: {payload}")
 
-    response = requests.post(url, headers=headers, json=payload)
-    print(f"📡 Status code: {response.status_code}")
+async def get_text_embeddings(texts: list[str]) -> list[list[float]]:
+    """
+    Send a batch of texts to the DIAL embedding endpoint in one request.
+    Returns one vector per input, in input order.
+    """
+    response = await dial_client.post(
+        f"/openai/deployments/{DIAL_DEPLOYMENT_NAME}/embeddings",
+        {"input": texts},
+    )
+    logger.debug(f"DIAL embeddings status code: {response.status_code}")
 
     try:
         response.raise_for_status()
-        data = response.json()
-        embedding = data["data"][0]["embedding"]
-        print(f"Received embedding of length {len(embedding)}")
-        print(f"First 10 values: {embedding[:10]}") 
-        return embedding
+        data = sorted(response.json()["data"], key=lambda item: item["index"])
+        if len(data) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(data)}")
+        logger.debug(f"Received {len(data)} embeddings")
+        return [item["embedding"] for item in data]
     except Exception as e:
-        print("Error parsing response:")
-        print(response.text)
+        logger.error(f"Error parsing embedding response: {response.text}")
         raise RuntimeError("Failed to get text embedding") from e
 
 
@@ -46,12 +43,6 @@ async def parse_resume_with_dial(resume_text: str) -> dict:
     Send resume text to DIAL LLM and get structured Python dict (parsed resume).
     """
 
-    url = f"https://ai-proxy.lab.epam.com/openai/deployments/gpt-4/chat/completions?api-version={DIAL_API_VERSION}"
-    headers = {
-        "Content-Type": "application/json",
-        "Api-Key": DIAL_API_KEY
-    }
-
     prompt = f"""
 You are a professional resume parser.
 
@@ -76,7 +67,7 @@ Respond with only valid JSON. Do not include Markdown formatting or explanation.
         "temperature": 0.2,
         "max_tokens": 1200
     }
-    response = requests.post(url, headers=headers, json=payload)
+    response = await dial_client.post("/openai/deployments/gpt-4/chat/completions", payload)
 
     if response.status_code == 200:
         content = response.json()["choices"][0]["message"]["content"].strip()
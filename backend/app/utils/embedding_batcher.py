@@ -0,0 +1,102 @@
+import asyncio
+from config.settings import settings
+from utils.dial_parser import get_text_embeddings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent embedding requests into batched DIAL calls.
+
+    Callers enqueue a text and await a future; a collector task flushes a batch as soon
+    as it holds `embedding_batch_size` texts or `embedding_batch_wait_ms` has passed since
+    the first one arrived. Identical texts within a batch are sent once.
+    """
+
+    def __init__(self):
+        self._queue: asyncio.Queue | None = None
+        self._collector: asyncio.Task | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def start(self):
+        """Start the collector task. Called from the app lifespan; also done lazily on first use."""
+        if self._collector is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._collector = asyncio.create_task(self._collect())
+        logger.info("Embedding batcher started.")
+
+    async def close(self):
+        """Stop collecting, let in-flight batches finish and fail anything still queued."""
+        if self._collector is None:
+            return
+        self._collector.cancel()
+        try:
+            await self._collector
+        except asyncio.CancelledError:
+            pass
+        self._collector = None
+
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        while not self._queue.empty():
+            self._fail([self._queue.get_nowait()])
+        logger.info("Embedding batcher stopped.")
+
+    async def embed(self, text: str) -> list[float]:
+        """Queue `text` for the next batch and wait for its vector."""
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        max_wait = settings.embedding_batch_wait_ms / 1000
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + max_wait
+            try:
+                while len(batch) < settings.embedding_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Cancelled by close() mid-batch: these requests are off the queue already
+                self._fail(batch)
+                raise
+
+            # Flush concurrently so a slow batch does not hold up collecting the next one;
+            # the DIAL client semaphore bounds how many run at once.
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    @staticmethod
+    def _fail(batch: list[tuple[str, asyncio.Future]]):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("Embedding batcher is shutting down"))
+
+    async def _flush(self, batch: list[tuple[str, asyncio.Future]]):
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            vectors = dict(zip(texts, await get_text_embeddings(texts)))
+            logger.info(f"Embedded batch of {len(texts)} texts for {len(batch)} requests")
+            for text, future in batch:
+                if not future.done():
+                    future.set_result(vectors[text])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+embedding_batcher = EmbeddingBatcher()
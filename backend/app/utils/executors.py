@@ -0,0 +1,181 @@
+import asyncio
+import functools
+import signal
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from config.settings import settings
+from utils.logger import setup_logger
+from utils.metrics import EXECUTOR_TASK_DURATION
+
+logger = setup_logger(__name__)
+
+# Upper bounds (ms) of the task latency histogram buckets; the last one catches everything
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+
+class ExecutionTimeout(Exception):
+    """Raised inside a worker process when a call overruns its deadline."""
+
+
+def _raise_execution_timeout(signum, frame):
+    raise ExecutionTimeout()
+
+
+def _call_with_deadline(call, timeout: float):
+    # Runs in the worker process, so the deadline starts when the call does and a
+    # runaway call is interrupted there instead of holding the worker
+    previous = signal.signal(signal.SIGALRM, _raise_execution_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return call()
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class InstrumentedExecutor:
+    """
+    Named, bounded executor that the event loop hands blocking work to.
+
+    The underlying pool is created on first use. Calls wait for a free worker on the event
+    loop, so a timeout only covers execution. Latency is measured from submission to
+    completion, so it includes the time a call waited for a free worker.
+    """
+
+    def __init__(self, name: str, executor_class: type[Executor], max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor_class = executor_class
+        self._executor: Executor | None = None
+        self._is_process_pool = issubclass(executor_class, ProcessPoolExecutor)
+        self._slots = asyncio.Semaphore(max_workers)
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._recycled = 0
+        self._latency_counts = [0] * len(LATENCY_BUCKETS_MS)
+        self._latency_sum_ms = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._executor_class(max_workers=self.max_workers)
+            logger.info(f"{self.name} executor started with {self.max_workers} workers.")
+        return self._executor
+
+    async def run(self, func, *args, timeout: float | None = None, **kwargs):
+        """
+        Run `func(*args, **kwargs)` in the pool and await its result.
+
+        Process pools need a picklable, module-level `func`. There the timeout is enforced
+        in the worker with SIGALRM; a call stuck in native code that ignores it for another
+        `executor_kill_grace_seconds` gets the pool's processes killed and the pool replaced,
+        failing the other calls running in it. Thread pools only stop waiting on a timeout.
+
+        Raises:
+            asyncio.TimeoutError: If the call runs for more than `timeout` seconds.
+        """
+        call = functools.partial(func, *args, **kwargs)
+        wait_timeout = timeout
+        if timeout and self._is_process_pool:
+            call = functools.partial(_call_with_deadline, call, timeout)
+            wait_timeout = timeout + settings.executor_kill_grace_seconds
+
+        loop = asyncio.get_running_loop()
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            async with self._slots:
+                future = loop.run_in_executor(self._get_executor(), call)
+                try:
+                    result = await asyncio.wait_for(future, wait_timeout) if wait_timeout else await future
+                except asyncio.TimeoutError:
+                    if self._is_process_pool:
+                        self._recycle()
+                    raise
+            self._completed += 1
+            return result
+        except ExecutionTimeout:
+            self._timeouts += 1
+            raise asyncio.TimeoutError()
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._observe((time.perf_counter() - started) * 1000)
+
+    def _recycle(self):
+        """Kill the worker processes of a process pool whose call ignored its deadline."""
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        self._recycled += 1
+        # ProcessPoolExecutor has no public way to stop a busy worker before Python 3.14
+        for process in list(executor._processes.values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.error(f"{self.name} executor recycled: a call overran its deadline and was killed.")
+
+    def _observe(self, elapsed_ms: float):
+        EXECUTOR_TASK_DURATION.labels(self.name).observe(elapsed_ms / 1000)
+        self._latency_sum_ms += elapsed_ms
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self._latency_counts[i] += 1
+                break
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            logger.info(f"{self.name} executor shut down.")
+
+    def get_stats(self) -> dict:
+        observed = sum(self._latency_counts)
+        return {
+            "max_workers": self.max_workers,
+            "active": min(self._in_flight, self.max_workers),
+            "queued": max(0, self._in_flight - self.max_workers),
+            "completed": self._completed,
+            "failed": self._failed,
+            "timeouts": self._timeouts,
+            "recycled": self._recycled,
+            "latency_ms_avg": round(self._latency_sum_ms / observed, 3) if observed else 0.0,
+            "latency_ms_sum": round(self._latency_sum_ms, 3),
+            # Non-cumulative count per bucket, keyed by its upper bound
+            "latency_ms_histogram": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(LATENCY_BUCKETS_MS, self._latency_counts)
+            },
+        }
+
+
+# Threads for blocking network and file I/O (boto3, firebase_admin)
+io_executor = InstrumentedExecutor("io", ThreadPoolExecutor, settings.io_executor_workers)
+# Processes for CPU-bound work that holds the GIL (PDF/DOCX text extraction)
+cpu_executor = InstrumentedExecutor("cpu", ProcessPoolExecutor, settings.cpu_executor_workers)
+
+EXECUTORS = {executor.name: executor for executor in (io_executor, cpu_executor)}
+
+
+async def run_io(func, *args, **kwargs):
+    """Run a blocking I/O call on the io pool."""
+    return await io_executor.run(func, *args, **kwargs)
+
+
+async def run_cpu(func, *args, timeout: float | None = None, **kwargs):
+    """Run a CPU-bound call on the cpu process pool."""
+    return await cpu_executor.run(func, *args, timeout=timeout, **kwargs)
+
+
+def shutdown_executors(wait: bool = True):
+    for executor in EXECUTORS.values():
+        executor.shutdown(wait=wait)
+
+
+def get_executor_stats() -> dict:
+    return {name: executor.get_stats() for name, executor in EXECUTORS.items()}
@@ -1,22 +1,42 @@
+import asyncio
 from io import BytesIO
 import docx
 import fitz  
+from config.settings import settings
+from utils.executors import run_cpu
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# PyMuPDF and python-docx are CPU bound and hold the GIL, so they run in the
+# shared cpu process pool instead of on the event loop.
+
+
+def _pdf_to_text(file_content: bytes, max_pages: int) -> str:
+    with fitz.open(stream=file_content, filetype="pdf") as pdf:
+        pages = [pdf[i].get_text() for i in range(min(pdf.page_count, max_pages))]
+    return "".join(pages).strip()
+
+
+def _docx_to_text(file_content: bytes) -> str:
+    doc = docx.Document(BytesIO(file_content))
+    return "\n".join(para.text for para in doc.paragraphs).strip()
+
+
+async def _run_in_pool(func, *args) -> str:
+    try:
+        return await run_cpu(func, *args, timeout=settings.extraction_timeout_seconds)
+    except asyncio.TimeoutError:
+        raise ValueError(f"Text extraction timed out after {settings.extraction_timeout_seconds}s")
+
 
 async def extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text from PDF file."""
-    text = ""
-    pdf = fitz.open(stream=file_content, filetype="pdf")
-    for page in pdf:
-        text += page.get_text()
-    return text.strip()
+    """Extract text from PDF file (first `extraction_max_pages` pages)."""
+    return await _run_in_pool(_pdf_to_text, file_content, settings.extraction_max_pages)
 
 async def extract_text_from_docx(file_content: bytes) -> str:
     """Extract text from DOCX file."""
-    text = ""
-    doc = docx.Document(BytesIO(file_content))
-    for para in doc.paragraphs:
-        text += para.text + "\n"
-    return text.strip()
+    return await _run_in_pool(_docx_to_text, file_content)
 
 async def extract_text(file_content: bytes, content_type: str) -> str:
     """Main text extractor based on MIME type."""
@@ -0,0 +1,154 @@
+import functools
+import time
+from contextlib import contextmanager
+from prometheus_client import Counter, Histogram, start_http_server
+from pymongo import monitoring
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Seconds; wide enough for sub-millisecond cache hits and multi-second LLM calls
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status code.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+DEPENDENCY_REQUEST_DURATION = Histogram(
+    "dependency_request_duration_seconds",
+    "Latency of outbound calls by dependency (dial, s3, mongo, postgres, firebase) and operation.",
+    ["dependency", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+BACKGROUND_TASK_DURATION = Histogram(
+    "background_task_duration_seconds",
+    "Duration of task queue handlers by task kind and outcome.",
+    ["kind", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+BACKGROUND_TASK_FAILURES = Counter(
+    "background_task_failures_total",
+    "Failed task queue attempts by task kind.",
+    ["kind"],
+)
+
+EXECUTOR_TASK_DURATION = Histogram(
+    "executor_task_duration_seconds",
+    "Time from submission to completion of calls run on the shared executors.",
+    ["executor"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def observe_dependency(dependency: str, operation: str, seconds: float, outcome: str = "success"):
+    DEPENDENCY_REQUEST_DURATION.labels(dependency, operation, outcome).observe(seconds)
+
+
+@contextmanager
+def track_dependency(dependency: str, operation: str):
+    """Time the enclosed call (sync or awaited) as one outbound request; exceptions count as errors."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        observe_dependency(dependency, operation, time.perf_counter() - started, outcome)
+
+
+def timed_dependency(dependency: str, operation: str, func):
+    """
+    Wrap a blocking `func` so each call is timed where it runs.
+
+    Pass the wrapper to run_io instead of tracking the await, which would also count the
+    time the call waited for a free executor thread.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with track_dependency(dependency, operation):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def serve_metrics(port: int, name: str) -> bool:
+    """
+    Serve this process's Prometheus registry on `port`, in a daemon thread.
+
+    Metrics are per process and the port is fixed, so this assumes one process per port
+    (a single uvicorn worker, one worker.py per host). Any further process on the host fails
+    to bind; it logs that and carries on without exporting, instead of failing startup.
+    """
+    try:
+        start_http_server(port)
+    except OSError as e:
+        logger.warning(f"{name} metrics not served, port {port} is unavailable ({e}); "
+                       f"run one process per metrics port to export them.")
+        return False
+    logger.info(f"{name} metrics served on port {port}.")
+    return True
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """pymongo listener recording every command's server round trip."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        observe_dependency("mongo", event.command_name, event.duration_micros / 1e6)
+
+    def failed(self, event):
+        observe_dependency("mongo", event.command_name, event.duration_micros / 1e6, "error")
+
+
+def instrument_s3_client(client):
+    """Record the latency of every call made through a boto3 S3 client, by operation name."""
+
+    def before_call(model, context, **kwargs):
+        context["metrics_started"] = time.perf_counter()
+
+    def after_call(http_response, model, context, **kwargs):
+        outcome = "success" if http_response.status_code < 300 else "error"
+        observe_dependency("s3", model.name, time.perf_counter() - context["metrics_started"], outcome)
+
+    def after_call_error(context, **kwargs):
+        # Transport failures: no HTTP response; the operation name is in the event name only
+        operation = kwargs.get("event_name", "").rsplit(".", 1)[-1] or "unknown"
+        observe_dependency("s3", operation, time.perf_counter() - context["metrics_started"], "error")
+
+    client.meta.events.register("before-call.s3", before_call)
+    client.meta.events.register("after-call.s3", after_call)
+    client.meta.events.register("after-call-error.s3", after_call_error)
+    return client
+
+
+def instrument_sqlalchemy_engine(sync_engine):
+    """Record the latency of every statement executed through `sync_engine`, by SQL verb."""
+    from sqlalchemy import event
+
+    def _operation(statement: str) -> str:
+        words = statement.lstrip().split(None, 1)
+        return words[0].upper() if words else "UNKNOWN"
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["metrics_started"].pop()
+        observe_dependency("postgres", _operation(statement), time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is None or not conn.info.get("metrics_started"):
+            return
+        started = conn.info["metrics_started"].pop()
+        statement = exception_context.statement or ""
+        observe_dependency("postgres", _operation(statement), time.perf_counter() - started, "error")
@@ -0,0 +1,30 @@
+import base64
+import json
+
+
+def encode_cursor(values: list) -> str:
+    """Pack the keyset values of the last row of a page into an opaque, URL-safe cursor."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: tuple) -> list:
+    """
+    Unpack a cursor made by `encode_cursor`, holding one value per entry of `types`,
+    e.g. `decode_cursor(cursor, (str, str))`. An entry may be a tuple of types.
+
+    Raises:
+        ValueError: If the cursor is malformed or a value is not of its expected type.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Invalid cursor")
+    for value, expected in zip(values, types):
+        # bool is an int subclass; JSON true/false is never a valid keyset value
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,140 @@
+"""
+Background worker: claims tasks from the Postgres queue and runs them.
+
+Run alongside the API with `python worker.py` from the app directory.
+"""
+import asyncio
+import signal
+import time
+from config.settings import settings
+from db.database import engine, task_session
+from db.task_queue import claim_tasks, complete_task, expire_exhausted_tasks, fail_task, renew_lease
+from services.tasks import TASK_EXPIRED_HANDLERS, TASK_HANDLERS
+from utils.dial_client import dial_client
+from utils.embedding_batcher import embedding_batcher
+from utils.executors import shutdown_executors
+from utils.logger import setup_logger
+from utils.metrics import BACKGROUND_TASK_DURATION, BACKGROUND_TASK_FAILURES, serve_metrics
+
+logger = setup_logger("worker")
+
+
+class Worker:
+    """Polls the queue and runs up to task_worker_concurrency tasks, with per-kind limits."""
+
+    def __init__(self):
+        self._stopping = asyncio.Event()
+        self._running: dict[str, set[asyncio.Task]] = {kind: set() for kind in TASK_HANDLERS}
+
+    def stop(self):
+        logger.info("Worker stop requested, finishing running tasks.")
+        self._stopping.set()
+
+    def _free_slots(self, kind: str) -> int:
+        total_running = sum(len(tasks) for tasks in self._running.values())
+        kind_limit = settings.task_kind_concurrency.get(kind, settings.task_worker_concurrency)
+        return min(settings.task_worker_concurrency - total_running, kind_limit - len(self._running[kind]))
+
+    async def run(self):
+        logger.info(f"Worker started, concurrency {settings.task_worker_concurrency}.")
+        while not self._stopping.is_set():
+            claimed = 0
+            for kind in TASK_HANDLERS:
+                slots = self._free_slots(kind)
+                if slots <= 0:
+                    continue
+                try:
+                    async with task_session() as db:
+                        expired = await expire_exhausted_tasks(db, kind)
+                        tasks = await claim_tasks(db, kind, slots)
+                except Exception as e:
+                    logger.error(f"Failed to claim {kind} tasks: {e}")
+                    expired, tasks = [], []
+                for task in expired:
+                    await self._on_expired(task)
+                for task in tasks:
+                    running = asyncio.create_task(self._execute(task))
+                    self._running[kind].add(running)
+                    running.add_done_callback(self._running[kind].discard)
+                claimed += len(tasks)
+
+            if not claimed:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), settings.task_poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+        pending = [task for tasks in self._running.values() for task in tasks]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        logger.info("Worker stopped.")
+
+    async def _on_expired(self, task):
+        BACKGROUND_TASK_FAILURES.labels(task.kind).inc()
+        logger.error(f"Task {task.id} ({task.kind}) lost its worker on the final attempt, marked failed")
+        handler = TASK_EXPIRED_HANDLERS.get(task.kind)
+        if handler is not None:
+            try:
+                await handler(task.payload)
+            except Exception as e:
+                logger.error(f"Expiry handler for task {task.id} failed: {e}")
+
+    async def _heartbeat(self, task_id):
+        """Renew the lease a few times per lease period while the handler runs."""
+        interval = settings.task_lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with task_session() as db:
+                    await renew_lease(db, task_id)
+            except Exception as e:
+                logger.warning(f"Lease renewal for task {task_id} failed: {e}")
+
+    async def _execute(self, task):
+        logger.info(f"Running task {task.id} ({task.kind}), attempt {task.attempts}/{task.max_attempts}")
+        started = time.perf_counter()
+        heartbeat = asyncio.create_task(self._heartbeat(task.id))
+        try:
+            try:
+                await TASK_HANDLERS[task.kind](task.payload, task.attempts >= task.max_attempts)
+            finally:
+                heartbeat.cancel()
+        except Exception as e:
+            BACKGROUND_TASK_DURATION.labels(task.kind, "failure").observe(time.perf_counter() - started)
+            BACKGROUND_TASK_FAILURES.labels(task.kind).inc()
+            logger.error(f"Task {task.id} ({task.kind}) failed: {e}", exc_info=True)
+            async with task_session() as db:
+                await fail_task(db, task, f"{type(e).__name__}: {e}")
+            return
+
+        BACKGROUND_TASK_DURATION.labels(task.kind, "success").observe(time.perf_counter() - started)
+        async with task_session() as db:
+            await complete_task(db, task.id)
+        logger.info(f"Task {task.id} ({task.kind}) succeeded")
+
+
+async def main():
+    if settings.worker_metrics_port:
+        serve_metrics(settings.worker_metrics_port, "Worker")
+    await dial_client.start()
+    await embedding_batcher.start()
+
+    worker = Worker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:  # Windows
+            pass
+
+    try:
+        await worker.run()
+    finally:
+        await embedding_batcher.close()
+        await dial_client.close()
+        await engine.dispose()
+        shutdown_executors()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())